@@ -6,40 +6,38 @@ Self-healing, self-orchestrating execution loop.
 """
 import os
 import re
+import sys
+import ast
+import atexit
+import shutil
+import string
+import hashlib
 import time
 import json
+import logging
+import queue
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 from typing import Callable, Dict, List, Optional, Any
+from .base_agent import BaseAgent
 from .recycler import recycler
 from .router import router
-from .coder import coder
 from .research import researcher
 from .context_manager import context
-from .config import WORKSPACE_DIR
+from .config import WORKSPACE_DIR, TOKEN_LIMITS
 from .qa import qa_agent
 from .project_manager import project_manager
 from .terminal import terminal
 from .code_indexer import code_indexer
-from .design_creativity import design_creativity
-from .visual_qa import visual_qa
-from .prompt_refiner import prompt_refiner
-from .devtools import devtools  # CTO-level dev tools
-
-# Additional specialist agents for routing
-from .code_reviewer import code_reviewer
-from .security_auditor import security_auditor
-from .brute_research import brute_researcher
-from .synthesis import synthesizer
-
-# New specialized development agents
-from .frontend_dev import frontend_dev
-from .backend_dev import backend_dev
-from .ai_ops import ai_ops
-from .strategy import strategy
-from .architect import architect
-from .product_manager import product_manager
-from .uiux import uiux
-from .seo import seo_specialist
+
+# Specialist agents (coder, code_reviewer, security_auditor, brute_researcher,
+# frontend_dev, backend_dev, architect, ...) plus visual_qa and prompt_refiner
+# are imported in the branch that uses them, so a run only loads what it routes to
 
 # === PREVIOUSLY UNUSED AGENTS - NOW INTEGRATED ===
 # Imports moved to local scope to prevent circular dependencies
@@ -96,6 +94,691 @@ from .project_builder import project_builder
 # NEW: Live logging for real-time visibility
 from .utils.live_logger import live_logger
 
+# Project naming: punctuation -> space (keeps '_' as a word char like \w)
+_PUNCT_TRANS = str.maketrans({c: ' ' for c in string.punctuation if c != '_'})
+_PROJECT_NAME_STOPWORDS = frozenset({'build', 'create', 'make', 'with', 'that', 'this', 'from', 'using'})
+
+
+@lru_cache(maxsize=128)
+def _project_name_for(objective: str) -> str:
+    """Project folder name for an objective (pure, so memoized)."""
+    # Extract key words and create short name
+    words = objective.lower().translate(_PUNCT_TRANS).split()
+    keywords = [w for w in words if len(w) > 3 and w not in _PROJECT_NAME_STOPWORDS]
+    name = '-'.join(keywords[:3]) if keywords else 'project'
+    return name.replace(' ', '-')[:30]
+
+
+# In-memory log is bounded; full history goes to a rotating file
+LOG_MEMORY_LIMIT = int(os.environ.get("JARVIS_LOG_CAP", 5000))
+EXECUTOR_LOG_PATH = os.path.join(WORKSPACE_DIR, "logs", "executor.log")
+# Document-only specialist steps allowed in flight at once (1 = no run-ahead)
+SPECIALIST_BATCH_SIZE = int(os.environ.get("JARVIS_SPECIALIST_BATCH", 1))
+
+# File writes for the history log happen on a listener thread, off the caller's path
+_HISTORY_QUEUE = queue.Queue()
+_HISTORY_LISTENER = None
+
+
+def _get_history_logger() -> logging.Logger:
+    """Executor history logger writing to a rotating file (configured once)."""
+    global _HISTORY_LISTENER
+    history = logging.getLogger("jarvis.executor")
+    if not history.handlers:
+        history.setLevel(logging.INFO)
+        history.propagate = False
+        try:
+            os.makedirs(os.path.dirname(EXECUTOR_LOG_PATH), exist_ok=True)
+            handler = RotatingFileHandler(
+                EXECUTOR_LOG_PATH, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _HISTORY_LISTENER = QueueListener(_HISTORY_QUEUE, handler)
+            _HISTORY_LISTENER.start()
+            history.addHandler(QueueHandler(_HISTORY_QUEUE))
+        except OSError:
+            history.addHandler(logging.NullHandler())
+    return history
+
+
+def _flush_history_log():
+    """Block until every queued history record has been written."""
+    if _HISTORY_LISTENER is not None:
+        _HISTORY_QUEUE.join()
+
+
+def _stop_history_listener():
+    """Drain and stop the history listener at interpreter exit."""
+    if _HISTORY_LISTENER is not None:
+        _HISTORY_LISTENER.stop()
+
+
+atexit.register(_stop_history_listener)
+
+
+_CLI_PATHS = {}  # CLI name -> absolute path, hits only
+
+
+def _cli_path(name: str) -> Optional[str]:
+    """Absolute path of a CLI on PATH, or None. Hits are remembered; misses are re-checked."""
+    path = _CLI_PATHS.get(name)
+    if path is None:
+        path = shutil.which(name)
+        if path:
+            _CLI_PATHS[name] = path
+    return path
+
+
+def _npm_path() -> str:
+    """Absolute npm path, looked up on PATH until found (resolves npm.cmd on Windows)."""
+    return _cli_path("npm") or _cli_path("npm.cmd") or "npm"
+
+
+def _npm_cmd(*args: str) -> List[str]:
+    """
+    npm argv for subprocess without a shell. A list with shell=True would drop
+    the arguments on POSIX and hide npm behind a shell.
+    """
+    return [_npm_path(), *args]
+
+
+# Console encoding is settled once per stdout object instead of per log line
+_CONSOLE_STREAM = None
+_CONSOLE_ASCII_ONLY = False
+
+
+def _console_ascii_only() -> bool:
+    """Switch stdout to UTF-8 (errors replaced) once; True if it can't take non-ASCII."""
+    global _CONSOLE_STREAM, _CONSOLE_ASCII_ONLY
+    stream = sys.stdout
+    if stream is not _CONSOLE_STREAM:
+        _CONSOLE_STREAM = stream
+        _CONSOLE_ASCII_ONLY = False
+        try:
+            stream.reconfigure(encoding="utf-8", errors="replace")
+        except AttributeError:
+            # Wrapper without reconfigure: usable only if its encoding takes our emoji
+            try:
+                "✅".encode(getattr(stream, "encoding", None) or "utf-8")
+            except (UnicodeEncodeError, LookupError):
+                _CONSOLE_ASCII_ONLY = True
+        except Exception:
+            _CONSOLE_ASCII_ONLY = True
+    return _CONSOLE_ASCII_ONLY
+
+
+def _console_ascii_fallback():
+    """A print hit an encoding error: strip non-ASCII for this stream from now on."""
+    global _CONSOLE_ASCII_ONLY
+    _CONSOLE_ASCII_ONLY = True
+
+
+# Console lines from _log are flushed in bursts; warnings/errors go out at once
+CONSOLE_FLUSH_INTERVAL = 1.0  # seconds
+_URGENT_LOG_RE = re.compile('⚠|❌|ERROR|FAILED')
+
+
+def _flush_console():
+    """Flush stdout (ignoring streams that are already closed)."""
+    try:
+        sys.stdout.flush()
+    except (OSError, ValueError):
+        pass
+
+
+# Shared headless browser for dev-server previews, started on first use.
+# Sync Playwright is bound to the thread that started it.
+_PLAYWRIGHT = None
+_BROWSER = None
+_BROWSER_THREAD = None
+
+
+def _get_preview_browser():
+    """Return the shared preview browser, or None if it belongs to another thread."""
+    global _PLAYWRIGHT, _BROWSER, _BROWSER_THREAD
+    if _BROWSER_THREAD is not None and _BROWSER_THREAD != threading.get_ident():
+        return None
+    if _BROWSER is not None and _BROWSER.is_connected():
+        return _BROWSER
+    
+    from playwright.sync_api import sync_playwright
+    _close_preview_browser()
+    _PLAYWRIGHT = sync_playwright().start()
+    _BROWSER = _PLAYWRIGHT.chromium.launch(headless=True)
+    _BROWSER_THREAD = threading.get_ident()
+    return _BROWSER
+
+
+def _close_preview_browser():
+    """Shut down the shared preview browser (also run at interpreter exit)."""
+    global _PLAYWRIGHT, _BROWSER, _BROWSER_THREAD
+    try:
+        if _BROWSER is not None:
+            _BROWSER.close()
+        if _PLAYWRIGHT is not None:
+            _PLAYWRIGHT.stop()
+    except Exception:
+        pass
+    _PLAYWRIGHT = _BROWSER = _BROWSER_THREAD = None
+
+
+atexit.register(_close_preview_browser)
+
+# Dev servers started by any executor, terminated at interpreter exit
+_DEV_SERVER_PROCS = []
+
+
+def _stop_dev_servers():
+    for process in _DEV_SERVER_PROCS:
+        if process.poll() is None:
+            try:
+                process.terminate()
+            except OSError:
+                pass
+
+
+atexit.register(_stop_dev_servers)
+
+PREVIEW_SETTLE_TIMEOUT_MS = 3000  # Max extra wait for a previewed page's network to go idle
+
+
+def _load_preview_page(page, url: str):
+    """
+    Load url for a screenshot: wait for the load event, then give late fetches
+    a short, bounded chance to settle (dev servers keep HMR sockets open, so
+    networkidle alone can sit until its timeout).
+    """
+    page.goto(url, wait_until="load", timeout=15000)
+    try:
+        page.wait_for_load_state("networkidle", timeout=PREVIEW_SETTLE_TIMEOUT_MS)
+    except Exception:
+        pass  # Screenshot what has rendered
+
+
+class _AutonomousLLMAgent(BaseAgent):
+    """Plain LLM agent used for the executor's direct (non-specialist) calls."""
+    
+    def __init__(self):
+        super().__init__("autonomous")
+    
+    def _get_system_prompt(self):
+        return "You are Jarvis, an autonomous AI assistant completing a multi-step task."
+    
+    def run(self, task: str) -> str:
+        return self.call_llm(task)
+
+
+class _KeywordClassifier:
+    """
+    Several ordered keyword cascades ("axes") answered by one regex scan.
+    Keeps `any(kw in text)` substring semantics per axis: the lookahead lets
+    matches overlap, alternatives are longest-first, and every keyword that is
+    a prefix of the matched one has its ranks folded in at build time.
+    """
+    
+    def __init__(self, axes: Dict[str, tuple]):
+        self.labels = {axis: [label for label, _ in tiers] for axis, (tiers, _) in axes.items()}
+        self.defaults = {axis: default for axis, (_, default) in axes.items()}
+        own = {}
+        for axis, (tiers, _) in axes.items():
+            for rank, (_, keywords) in enumerate(tiers):
+                for kw in keywords:
+                    own.setdefault(kw, {}).setdefault(axis, rank)
+        # Only the longest keyword starting at a position is reported, so it
+        # carries the best rank of every shorter keyword it starts with
+        self.ranks = {}
+        for kw in own:
+            merged = {}
+            for other, other_ranks in own.items():
+                if kw.startswith(other):
+                    for axis, rank in other_ranks.items():
+                        if rank < merged.get(axis, rank + 1):
+                            merged[axis] = rank
+            self.ranks[kw] = merged
+        alternation = '|'.join(re.escape(kw) for kw in sorted(own, key=len, reverse=True))
+        self.pattern = re.compile(f'(?=({alternation}))')
+    
+    def classify(self, text_lower: str) -> Dict[str, Optional[str]]:
+        """Return the first-tier label per axis for keywords found in text_lower."""
+        best = {}
+        for m in self.pattern.finditer(text_lower):
+            for axis, rank in self.ranks[m.group(1)].items():
+                if rank < best.get(axis, rank + 1):
+                    best[axis] = rank
+        return {
+            axis: self.labels[axis][best[axis]] if axis in best else default
+            for axis, default in self.defaults.items()
+        }
+
+
+_TASK_TYPE_TIERS = [
+    ("coding", [
+        "build", "create", "develop", "code", "implement", "website", "app",
+        "frontend", "backend", "api", "component", "page", "feature",
+        "react", "python", "javascript", "html", "css", "database",
+        "deploy", "fix bug", "refactor", "landing page", "saas"
+    ]),
+    ("research", [
+        "research", "investigate", "find out", "look into", "analyze market",
+        "competitor analysis", "industry trends", "gather information",
+        "what is", "how does", "why do", "explore options"
+    ]),
+    ("writing", [
+        "write", "draft", "compose", "create content", "blog post",
+        "article", "email", "pitch", "proposal", "documentation",
+        "copy", "script", "outline", "summary"
+    ]),
+    ("analysis", [
+        "analyze", "evaluate", "assess", "compare", "review",
+        "audit", "measure", "calculate", "forecast", "model",
+        "data analysis", "metrics", "performance"
+    ]),
+]
+
+_DOMAIN_TIERS = [
+    ("frontend", ["react", "component", "jsx", "css", "html", "ui", "frontend", "page"]),
+    ("backend", ["api", "route", "server", "endpoint", "express", "backend"]),
+    ("database", ["database", "schema", "table", "sql", "supabase", "migration"]),
+    ("research", ["market", "competitor", "research", "trend", "analysis"]),
+]
+
+# Keyword routing: category -> specialist (checked in order)
+_ROUTING_RULES = {
+    "FRONTEND": {
+        "keywords": ["ui", "component", "page", "css", "style", "react", "animation", "frontend", "responsive"],
+        "default_agent": "frontend_dev"
+    },
+    "BACKEND": {
+        "keywords": ["api", "endpoint", "database", "auth", "backend", "server", "crud", "rest", "graphql"],
+        "default_agent": "backend_dev"
+    },
+    "RESEARCH": {
+        "keywords": ["research", "investigate", "find", "search", "analyze"],
+        "default_agent": "brute_researcher"
+    },
+    "ACADEMIC": {
+        "keywords": ["paper", "academic", "cite", "publication", "journal", "abstract", "methodology"],
+        "default_agent": "academic_research"
+    },
+    "QA": {
+        "keywords": ["test", "qa", "quality", "debug", "fix bug", "error", "lint", "review"],
+        "default_agent": "qa_agent"
+    },
+    "OPS": {
+        "keywords": ["deploy", "docker", "kubernetes", "ci/cd", "production", "github", "push", "git"],
+        "default_agent": "ops"
+    },
+    "CONTENT": {
+        "keywords": ["write", "document", "blog", "content", "seo", "readme", "article"],
+        "default_agent": "content_writer"
+    },
+    "PRESENTATION": {
+        "keywords": ["pitch", "deck", "slides", "presentation", "investor"],
+        "default_agent": "pitch_deck"
+    },
+    "BUSINESS": {
+        "keywords": ["requirements", "stakeholder", "user story", "business", "analysis", "specification"],
+        "default_agent": "business_analyst"
+    }
+}
+
+# Specialists that may run ahead of earlier steps: they work from the step text
+# alone (no project reads) and their only side effects go through _save_output
+_BATCHABLE_AGENTS = frozenset({
+    "brute_researcher", "academic_research", "content_writer",
+    "pitch_deck", "business_analyst", "architect",
+})
+
+# Step markers that bypass keyword routing (checked before categories)
+_MARKER_ROUTES = {
+    "COMPONENT": {"agent": "component_builder", "category": "FRONTEND", "use_specialist": False},
+    "ARCHITECTURE": {"agent": "architect", "category": "ARCHITECTURE", "use_specialist": True},
+    "INTEGRATION": {"agent": "integrator", "category": "FRONTEND", "use_specialist": False},
+}
+_MARKER_TIERS = [
+    ("COMPONENT", ["[component", "complete module"]),
+    ("ARCHITECTURE", ["[architecture", "system design"]),
+    ("INTEGRATION", ["[integration"]),
+]
+
+# Task type, domain, route marker and routing category share one scan of the text
+_CLASSIFIER = _KeywordClassifier({
+    "task_type": (_TASK_TYPE_TIERS, "general"),
+    "domain": (_DOMAIN_TIERS, "decisions"),
+    "marker": (_MARKER_TIERS, None),
+    "category": ([(cat, cfg["keywords"]) for cat, cfg in _ROUTING_RULES.items()], None),
+})
+
+
+@lru_cache(maxsize=256)
+def _classify_cached(text: str) -> Dict[str, Optional[str]]:
+    return _CLASSIFIER.classify(text.lower())
+
+
+def classify(text: str) -> Dict[str, Optional[str]]:
+    """
+    Classify text as {"task_type", "domain", "marker", "category"} in a single pass.
+    Results are memoized; the same step text is classified several times per step.
+    """
+    return dict(_classify_cached(text))
+
+# VERY SPECIFIC signals that the LLM must explicitly output
+# Generic terms like "done" trigger false positives
+_COMPLETION_SIGNALS = [
+    "[task complete]",
+    "[all steps complete]",
+    "[project finished]",
+    "jarvis: task complete",
+    "=== task complete ===",
+    "[completion]",
+]
+_COMPLETION_RE = re.compile('|'.join(re.escape(signal) for signal in _COMPLETION_SIGNALS), re.IGNORECASE)
+
+# Output validation: placeholders (case-sensitive) and incomplete-code markers
+_PLACEHOLDERS = [
+    "[Company Name]", "[Your Name]", "[Your Company]",
+    "[specific initiative", "[TODO", "[PLACEHOLDER",
+    "[Company]", "[Name]", "[Contact]"
+]
+_INCOMPLETE_MARKERS = [
+    ("# TODO", "Contains TODO marker"),
+    ("// TODO", "Contains TODO marker"),
+    ("# FIXME", "Contains FIXME marker"),
+    ("// FIXME", "Contains FIXME marker"),
+    ("pass  # ", "Contains pass placeholder"),
+    ("...", "Contains ellipsis placeholder"),
+    ("# add more", "Contains 'add more' placeholder"),
+    ("// add more", "Contains 'add more' placeholder"),
+    ("# implement", "Contains 'implement' placeholder"),
+    ("// implement", "Contains 'implement' placeholder"),
+    ("raise NotImplementedError", "Contains NotImplementedError"),
+]
+# Lookahead so overlapping markers (e.g. "pass  # " / "# implement") are all seen
+_PLACEHOLDER_RE = re.compile('(?=(' + '|'.join(re.escape(p) for p in _PLACEHOLDERS) + '))')
+_INCOMPLETE_MARKER_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(m.lower()) for m, _ in _INCOMPLETE_MARKERS) + '))'
+)
+
+# Multi-perspective review: static security flags and performance hints, one scan
+_SECURITY_RED_FLAGS = [
+    ("eval(", "CRITICAL: Use of eval() is dangerous"),
+    ("exec(", "CRITICAL: Use of exec() is dangerous"),
+    ("__import__", "WARNING: Dynamic import detected"),
+    ("pickle.load", "WARNING: Pickle deserialization can be unsafe"),
+    ("shell=True", "WARNING: Shell injection risk with subprocess"),
+    ("os.system(", "WARNING: Prefer subprocess over os.system"),
+]
+_REVIEW_SCAN_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(p) for p in [*(flag for flag, _ in _SECURITY_RED_FLAGS), "for ", "append("]) + '))'
+)
+
+# Step / code-extraction patterns
+_COMPONENT_TAG_RE = re.compile(r'\[COMPONENT[:\s]+([^\]]+)\]', re.IGNORECASE)
+_INTEGRATION_TAG_RE = re.compile(r'\[INTEGRATION', re.IGNORECASE)
+_ALPHA_WORD_RE = re.compile(r'[a-zA-Z]+')
+_FILE_SPLIT_RE = re.compile(r'(?:\/\/|#)\s*(src\/[^\n]+\.(?:tsx?|jsx?|css|py|json|md))\s*\n')
+_CODE_BLOCK_RE = re.compile(r'```(\w+)(?:\s+filename=["\']([^"\']+)["\'])?\n([\s\S]*?)```')
+# Generated files must not shadow these stdlib modules / pip packages
+_FORBIDDEN_FILENAMES = frozenset({
+    # Python stdlib
+    'base64', 'json', 'os', 'sys', 'io', 're', 'typing', 'datetime',
+    'time', 'math', 'random', 'hashlib', 'secrets', 'contextlib',
+    'collections', 'functools', 'itertools', 'sqlite3', 'urllib',
+    # Common pip packages - DO NOT SHADOW THESE
+    'passlib', 'sqlalchemy', 'jose', 'jwt', 'pydantic', 'fastapi',
+    'flask', 'requests', 'httpx', 'aiohttp', 'numpy', 'pandas',
+    'cryptography', 'bcrypt', 'dotenv', 'redis', 'celery',
+    'pytest', 'unittest', 'logging', 'asyncio', 'threading',
+    'multiprocessing', 'subprocess', 'pathlib', 'shutil', 'glob',
+    # Also catch variations
+    'pyjwt', 'python-jose', 'python-dotenv', 'psycopg2', 'pymongo'
+})
+_DEF_NAME_RE = re.compile(r'def (\w+)')
+_CLASS_NAME_RE = re.compile(r'class (\w+)')
+_FILE_COMMENT_RE = re.compile(r'^(?://|#|\*/?\*?)\s*([a-zA-Z0-9_/.-]+\.[a-zA-Z]+)')
+_IMPORT_RE = re.compile(r'^(?:from\s+(\w+)|import\s+(\w+))', re.MULTILINE)
+_IMPORT_BYTES_RE = re.compile(rb'^(?:from\s+(\w+)|import\s+(\w+))', re.MULTILINE)
+_CMD_RE = re.compile(r'\[COMMAND\]:\s*(.+?)(?:\n|$)', re.IGNORECASE)
+_RUN_RE = re.compile(r'(?:run|execute)[:\s]+`?([^`\n]+)`?', re.IGNORECASE)
+_NETLIFY_URL_RE = re.compile(r'(https://[^\s]+\.netlify\.app)')
+_VERCEL_URL_RE = re.compile(r'(https://[^\s]+\.vercel\.app)')
+_EDIT_RE = re.compile(
+    r'\[EDIT\]\s*([^:]+):\s*(?:replace|change)\s*["\'](.+?)["\']\s*(?:with|to)\s*["\'](.+?)["\']',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Plan parsing: line filters and step prefix cleanup
+_PHASE_LABEL_RE = re.compile(r'^(PHASE|Phase)\s*\d*[:\s]*$')
+_PHASE_HEADING_RE = re.compile(r'^#+ (PHASE|Phase)')
+_NUMBER_PREFIX_RE = re.compile(r'^[\d]+[\.\)\:\-\s]+')
+_TAG_PREFIX_RE = re.compile(r'^\[.*?\]\s*')
+_BOLD_SUFFIX_RE = re.compile(r'\*+$')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]\s+')
+# Each branch's prefix cleanup fused into one anchored pattern; the optional
+# groups apply in the same order as the sub() chains they replace
+_OPT_TAG_PREFIX = r'(?:\[.*?\]\s*)?'
+_OPT_STEP_PREFIX = r'(?:Step\s*\d*[:\.]?\s*)?'
+_NUMBERED_STEP_CLEAN_RE = re.compile(r'^[\d]+[\.\)\:\-\s]+' + _OPT_TAG_PREFIX + _OPT_STEP_PREFIX)
+_BULLET_STEP_CLEAN_RE = re.compile(r'^[\-\*•\s]+' + _OPT_TAG_PREFIX)
+_HEADING_STEP_CLEAN_RE = re.compile(r'^#+\s*(?:[\d]+[\.\)\:\-\s]+)?' + _OPT_STEP_PREFIX + _OPT_TAG_PREFIX)
+_BOLD_STEP_CLEAN_RE = re.compile(r'^\*+\s*' + _OPT_STEP_PREFIX + _OPT_TAG_PREFIX)
+_LINE_RE = re.compile(r'^[^\n]+', re.MULTILINE)  # Non-empty lines, lazily
+# Substring keyword checks, one scan each (same semantics as any(kw in text))
+_COMPLEX_PROJECT_RE = re.compile('|'.join([
+    "os", "system", "platform", "ecosystem", "full", "complete",
+    "entire", "everything", "crm", "dashboard", "app", "application",
+    "business", "enterprise", "management"
+]))
+_ACTION_WORD_RE = re.compile('|'.join([
+    'create', 'build', 'implement', 'add', 'design', 'develop', 'setup',
+    'configure', 'write', 'generate', 'define', 'test', 'integrate',
+    'deploy', 'optimize', 'research', 'analyze', 'document'
+]))
+_CODING_STEP_RE = re.compile('|'.join([
+    'implement', 'create', 'build', 'code', 'component', 'api',
+    'backend', 'frontend', 'database', 'auth', 'module'
+]))
+_RESEARCH_TASK_RE = re.compile('|'.join([
+    "research", "algorithm", "paper", "academic", "benchmark", "novel"
+]))
+# Project-type lock hints (checked in order by _detect_and_lock_project_type)
+_REACT_HINT_RE = re.compile('|'.join(map(re.escape, [
+    'react', 'next.js', 'nextjs', 'vite', 'jsx', 'tsx', 'component', 'frontend app', 'web app'
+])))
+_BACKEND_FRAMEWORK_RE = re.compile('|'.join([
+    'fastapi', 'flask', 'django', 'backend', 'api server'
+]))
+_PYTHON_HINT_RE = re.compile('|'.join([
+    'python script', 'fastapi', 'flask', 'django', 'backend', 'cli tool', 'data processing'
+]))
+_LANDING_HINT_RE = re.compile('|'.join([
+    'landing page', 'static site', 'html page', 'marketing page'
+]))
+_FULLSTACK_HINT_RE = re.compile('|'.join([
+    'fullstack', 'full-stack', 'full stack', 'frontend and backend'
+]))
+_WEB_HINT_RE = re.compile('|'.join(['web', 'app', 'ui', 'interface', 'page']))
+_SERVER_HINT_RE = re.compile('|'.join(['api', 'server', 'database']))
+
+
+class _FenceStream:
+    """
+    Tracks ``` fences in streamed LLM output and hands each block to on_block
+    as soon as its closing fence arrives. Only the open block is buffered.
+    Stops handing out blocks once a "// src/..." file marker is seen: the final
+    extraction then splits the response by markers and ignores fences.
+    """
+    
+    def __init__(self, on_block: Callable[[str], None]):
+        self.on_block = on_block
+        self._pending = ""   # Partial line still being streamed
+        self._block = None   # Lines of the open block, None outside a fence
+        self.saw_file_marker = False
+    
+    def feed(self, chunk: str):
+        self._pending += chunk
+        *lines, self._pending = self._pending.split('\n')
+        for line in lines:
+            if not self.saw_file_marker and _FILE_SPLIT_RE.search(line + '\n'):
+                self.saw_file_marker = True
+            if self._block is None:
+                if line.startswith('```'):
+                    self._block = [line]
+            else:
+                self._block.append(line)
+                if line.strip() == '```':
+                    block, self._block = self._block, None
+                    if not self.saw_file_marker:
+                        self.on_block('\n'.join(block))
+
+
+def _scandir_recursive(root: str):
+    """
+    Yield DirEntry objects for files under root in os.walk order (a directory's
+    files before its subdirectories), without following directory symlinks.
+    """
+    try:
+        with os.scandir(root) as entries:
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    yield entry
+                elif not entry.is_symlink():
+                    subdirs.append(entry.path)
+    except OSError:
+        return
+    for path in subdirs:
+        yield from _scandir_recursive(path)
+
+
+def _dir_entries(path: str, dirs_only: bool = False) -> set:
+    """Names directly under path (only directories if dirs_only), from one scandir; empty if missing."""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it if not dirs_only or entry.is_dir()}
+    except OSError:
+        return set()
+
+
+def _project_file_index(root: str) -> Dict[str, str]:
+    """File name -> path of its first occurrence under root, from one directory walk."""
+    index = {}
+    for entry in _scandir_recursive(root):
+        index.setdefault(entry.name, entry.path)
+    return index
+
+
+# Modules the dependency audit never treats as missing project files
+_COMMON_MODULES = frozenset({
+    'os', 'sys', 'json', 'time', 'datetime', 're', 'random', 
+    'math', 'collections', 'itertools', 'functools', 'typing',
+    'pathlib', 'subprocess', 'threading', 'multiprocessing',
+    'requests', 'numpy', 'pandas', 'networkx', 'matplotlib',
+    'pydantic', 'fastapi', 'sqlalchemy', 'uvicorn', 'sqlite3',
+    'asyncio', 'contextlib', 'shutil', 'logging', 'uuid', 'types',
+    'copy', 'enum', 'hashlib', 'base64', 'io', 'platform', 'mock',
+    'pytest', 'unittest', 'dataclasses', 'abc', 'argparse'
+})
+_KNOWN_MODULES = None
+AUDIT_WORKERS = 8  # Files read/parsed concurrently by the dependency audit
+# Smoke test driver: compiles each path in the JSON list on stdin, one JSON result line per path
+_SMOKE_DRIVER = '''
+import json, py_compile, sys
+for path in json.load(sys.stdin):
+    try:
+        py_compile.compile(path, doraise=True)
+        error = None
+    except Exception as e:
+        error = str(e)
+    print(json.dumps({"file": path, "error": error}))
+'''
+# The audit reads only a file's import prologue: up to the first top-level
+# definition, capped at AUDIT_HEAD_LINES lines
+AUDIT_HEAD_LINES = 200
+_AUDIT_STOP_PREFIXES = (b'def ', b'async def ', b'class ', b'@', b'if __name__')
+
+
+def _known_modules() -> frozenset:
+    """Stdlib + installed top-level packages + _COMMON_MODULES (computed once)."""
+    global _KNOWN_MODULES
+    if _KNOWN_MODULES is None:
+        known = set(_COMMON_MODULES) | set(sys.builtin_module_names)
+        known |= set(getattr(sys, "stdlib_module_names", ()))  # Python 3.10+
+        try:
+            from importlib.metadata import packages_distributions
+            known |= set(packages_distributions())
+        except Exception:
+            pass  # Older Python or broken metadata: find_spec still covers installs
+        _KNOWN_MODULES = frozenset(known)
+    return _KNOWN_MODULES
+
+
+def _top_level_imports(content, filename: str = "<generated>"):
+    """
+    Yield the top-level package of each module-level import in Python source
+    (str, or raw bytes decoded by the parser itself).
+    Imports nested in functions or try blocks are left out, as with the column-0
+    regex this replaces, which is still used if the source doesn't parse.
+    """
+    try:
+        tree = ast.parse(content, filename=filename)
+    except (SyntaxError, ValueError):
+        if isinstance(content, bytes):
+            for match in _IMPORT_BYTES_RE.finditer(content):
+                yield (match.group(1) or match.group(2)).decode('ascii', 'replace')
+        else:
+            for match in _IMPORT_RE.finditer(content):
+                yield match.group(1) or match.group(2)
+        return
+    
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield alias.name.split('.')[0]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            yield node.module.split('.')[0]
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _first_json_object(text: str) -> Optional[dict]:
+    """First JSON object embedded in text (nested values allowed), or None."""
+    start = text.find('{')
+    while start != -1:
+        try:
+            value, _ = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(value, dict):
+                return value
+        except ValueError:
+            pass
+        start = text.find('{', start + 1)
+    return None
+
+
+def _scan_file_imports(job):
+    """Audit worker: (filename, filepath) -> (imported packages, error or None)."""
+    filename, filepath = job
+    try:
+        # Raw bytes: the parser handles decoding, no separate text pass
+        head = []
+        quote = None  # Open triple quote, so stop prefixes inside docstrings don't count
+        with open(filepath, 'rb') as f:
+            for lineno, line in enumerate(f):
+                if lineno >= AUDIT_HEAD_LINES or (quote is None and line.startswith(_AUDIT_STOP_PREFIXES)):
+                    break
+                head.append(line)
+                for delim in (b'"""', b"'''"):
+                    if quote in (None, delim) and line.count(delim) % 2:
+                        quote = None if quote else delim
+        return list(_top_level_imports(b''.join(head), filename)), None
+    except Exception as e:
+        return [], e
+
 
 class AutonomousExecutor:
     """
@@ -112,14 +795,20 @@ class AutonomousExecutor:
     """
     
     def __init__(self):
-        self.is_running = False
+        # Set while NOT running, so stop() wakes anything waiting on it
+        self._stopped = threading.Event()
+        self._stopped.set()
+        # Set only by stop(), so helpers called outside run() aren't cancelled
+        self._cancel = threading.Event()
         self.is_paused = False  # NEW: Pause state
         self.current_task = None
         self.current_objective = ""  # Store the objective for reference
         self.iteration = 0
         self.max_iterations = 500  # Jarvis OUTWORKS other AIs - marathon by default
-        self.log = []
+        self.log = deque(maxlen=LOG_MEMORY_LIMIT)
         self.progress_callback = None
+        self._ts_cache = (0, "")  # (epoch second, "%H:%M:%S") for _log
+        self._last_console_flush = 0.0
         
         # === V4.0: PHASE LIMITS (prevent infinite loops) ===
         self.coding_iterations = 0
@@ -199,11 +888,62 @@ class AutonomousExecutor:
         }
         
         # Pause/Resume state
+        # Control commands from other threads go through this queue and are applied
+        # by the executor thread in _check_pause; the flags below are only written there.
+        self._cmd_queue = queue.SimpleQueue()
+        self._executor_thread_id = None
         self.pause_requested = False
-        self.resume_event = None  # Will be threading.Event()
         self.pause_reason = ""
         self.pending_modifications = []  # Plan changes during pause
         self.saved_state = {}  # State snapshot on pause
+        
+        # QA short-circuit: skip QA while the project tree is unchanged since the last QA run
+        self._last_qa_signature = None
+        self._last_qa_result = None
+        # Content digests of files this executor wrote (path -> (digest, mtime_ns))
+        self._written_digests = {}
+        # Paths seen to exist this run (positive results only; see _path_exists)
+        self._existing_paths = set()
+        # Python files that last compiled cleanly (path -> (mtime_ns, size))
+        self._compiled_ok = {}
+        # Source text read by validation/review (path -> ((mtime_ns, size), text))
+        self._source_cache = {}
+        # Running dev servers: (project_path, server_type) -> (Popen, info dict)
+        self._dev_servers = {}
+        # Context prefetch for upcoming steps: (step, task_type, project_path) -> Future
+        self._prefetch_pool = None
+        self._context_futures = {}
+        self.context_prefetch_depth = 2
+        # Project fingerprint when the outstanding prefetches were started
+        self._prefetch_signature = None
+        # Opt-in: later document-only specialist steps run ahead concurrently.
+        # (step, project_path) -> Future of (result, deferred saves)
+        self.specialist_batch_size = SPECIALIST_BATCH_SIZE  # Steps in flight at once; 1 disables batching
+        self._specialist_pool = None
+        self._specialist_futures = {}
+        # Set on run-ahead workers: saves are collected here and applied in step order
+        self._deferred_saves = threading.local()
+        # Files already recorded per .file_index.jsonl (loaded lazily)
+        self._file_index_seen = {}
+        self._llm_agent = None  # Created on first _call_llm
+        # Checkpoints are written by a background thread so the loop never waits on disk
+        self._ckpt_queue = queue.Queue()
+        self._ckpt_thread = None
+        # Memoized recycler.get_progress(), keyed by recycler state
+        self._progress_key = None
+        self._cached_progress = None
+    
+    @property
+    def is_running(self) -> bool:
+        """True while run() is active."""
+        return not self._stopped.is_set()
+    
+    @is_running.setter
+    def is_running(self, value: bool):
+        if value:
+            self._stopped.clear()
+        else:
+            self._stopped.set()
     
     def pause(self, reason: str = "User requested pause") -> Dict:
         """
@@ -213,8 +953,8 @@ class AutonomousExecutor:
         if not self.is_running:
             return {"success": False, "error": "Not currently running"}
         
-        self.pause_requested = True
-        self.pause_reason = reason
+        # pause_requested is owned by the executor thread (_check_pause/_enter_pause)
+        self._cmd_queue.put(("pause", reason))
         self._log(f"⏸️ Pause requested: {reason}")
         
         return {
@@ -235,15 +975,10 @@ class AutonomousExecutor:
             return {"success": False, "error": "Not currently paused"}
         
         if modifications:
-            self.pending_modifications.extend(modifications)
             self._log(f"📝 {len(modifications)} modifications queued")
         
-        self.is_paused = False
-        self.pause_requested = False
-        
-        # Signal resume if using threading
-        if self.resume_event:
-            self.resume_event.set()
+        # Wakes the executor thread blocked in _check_pause
+        self._cmd_queue.put(("resume", list(modifications or [])))
         
         self._log("▶️ Resuming execution")
         
@@ -253,10 +988,23 @@ class AutonomousExecutor:
             "modifications_applied": len(modifications) if modifications else 0
         }
     
+    def _get_progress(self) -> Dict:
+        """recycler.get_progress(), recomputed only when the step lists change."""
+        # Lists are also mutated in place (modify_plan) or reassigned, so key on
+        # identity and length as well as the recycler's version counter
+        key = (
+            getattr(recycler, "_version", None), recycler.task_objective,
+            id(recycler.pending_steps), len(recycler.pending_steps),
+            id(recycler.completed_steps), len(recycler.completed_steps),
+        )
+        if key != self._progress_key:
+            self._cached_progress = recycler.get_progress()
+            self._progress_key = key
+        return self._cached_progress
+    
     def get_state(self) -> Dict:
         """Get current execution state (useful when paused)."""
-        from .recycler import recycler
-        progress = recycler.get_progress()
+        progress = self._get_progress()
         
         return {
             "is_running": self.is_running,
@@ -269,7 +1017,7 @@ class AutonomousExecutor:
             "pending_steps": progress.get("pending_steps", []),
             "percent_complete": progress.get("percent", 0),
             "pending_modifications": self.pending_modifications,
-            "log_tail": self.log[-10:] if self.log else []
+            "log_tail": list(islice(reversed(self.log), 10))[::-1]
         }
     
     def modify_plan(self, action: str, step: str = None, position: int = None) -> Dict:
@@ -281,15 +1029,21 @@ class AutonomousExecutor:
             step: The step text
             position: For insert, where to insert
         """
-        from .recycler import recycler
+        # While running, only the executor thread touches the plan
+        if self.is_running and threading.get_ident() != self._executor_thread_id:
+            self._cmd_queue.put(("modify", action, step, position))
+            self._log(f"📝 Plan change queued: {action}")
+            return {"success": True, "queued": True, "pending_steps": list(recycler.pending_steps)}
         
         if action == "add":
             recycler.pending_steps.append(step)
             self._log(f"📌 Added step: {step}")
         elif action == "remove" and step:
-            if step in recycler.pending_steps:
+            try:
                 recycler.pending_steps.remove(step)
                 self._log(f"❌ Removed step: {step}")
+            except ValueError:
+                pass
         elif action == "insert" and position is not None:
             recycler.pending_steps.insert(position, step)
             self._log(f"📍 Inserted step at {position}: {step}")
@@ -306,112 +1060,178 @@ class AutonomousExecutor:
         self._log(f"📝 Note: {note}")
         
         # Also save to memory
-        from .memory import memory
         memory.save_fact(note, category="execution_notes")
         
         return {"success": True}
     
     def _check_pause(self) -> bool:
         """
-        Check if we should pause. Called between steps.
-        Returns True if paused, False to continue.
+        Apply queued control commands. Called between steps on the executor thread.
+        Blocks while paused; returns True if execution was paused.
         """
-        if self.pause_requested:
-            self.is_paused = True
-            self.pause_requested = False
-            
-            # Save state
-            from .recycler import recycler
-            self.saved_state = {
-                "iteration": self.iteration,
-                "progress": recycler.get_progress(),
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            self._log(f"⏸️ PAUSED at step {self.iteration}")
-            self._log(f"   Reason: {self.pause_reason}")
-            self._log("   Use executor.resume() to continue")
-            self._log("   Use executor.modify_plan() to change steps")
+        _flush_console()  # Step boundary: show everything logged by the last step
+        paused = False
+        # Consecutive queued removals are applied together in one pass over the plan
+        removals = Counter()
+        while True:
+            try:
+                # Block for the next command only while paused
+                if self.is_paused:
+                    self._remove_steps(removals)
+                    _flush_console()
+                    cmd = self._cmd_queue.get()
+                else:
+                    cmd = self._cmd_queue.get_nowait()
+            except queue.Empty:
+                self._remove_steps(removals)
+                return paused
             
-            # If using threading, wait for resume
-            if self.resume_event:
-                import threading
-                self.resume_event = threading.Event()
-                self.resume_event.wait()  # Block until resumed
+            kind = cmd[0]
+            if kind == "modify" and cmd[1] == "remove":
+                if cmd[2]:
+                    removals[cmd[2]] += 1
+                continue
+            self._remove_steps(removals)
             
-            return True
-        
-        return False
+            if kind == "modify":
+                self.modify_plan(*cmd[1:])
+            elif kind == "pause" and not self.is_paused:
+                self._enter_pause(cmd[1])
+                paused = True
+            elif kind == "resume" and self.is_paused:
+                self.pending_modifications.extend(cmd[1])
+                self.is_paused = False
+                self._apply_pending_modifications()
+            elif kind == "stop":
+                self.is_paused = False
+                return paused
+    
+    def _enter_pause(self, reason: str):
+        """Mark paused and snapshot state (executor thread only)."""
+        self.is_paused = True
+        self.pause_requested = False
+        self.pause_reason = reason
+        # Steps started ahead are redone after resume, against the plan as it is then
+        self._discard_all_specialists()
+        
+        # Save state
+        self.saved_state = {
+            "iteration": self.iteration,
+            "progress": self._get_progress(),
+            "timestamp": datetime.now().isoformat()
+        }
+        self._queue_checkpoint(
+            pending_steps=recycler.pending_steps,
+            project_path=project_builder.project_path,
+            metadata={"paused": True, "reason": self.pause_reason}
+        )
+        
+        self._log(f"⏸️ PAUSED at step {self.iteration}")
+        self._log(f"   Reason: {self.pause_reason}")
+        self._log("   Use executor.resume() to continue")
+        self._log("   Use executor.modify_plan() to change steps")
+    
+    def _queue_checkpoint(self, pending_steps: List, project_path: str = None, metadata: Dict = None):
+        """Snapshot the current step state and hand it to the checkpoint writer thread."""
+        self._ckpt_queue.put({
+            "objective": recycler.task_objective,
+            "iteration": self.iteration,
+            "completed_steps": list(recycler.completed_steps),
+            "pending_steps": list(pending_steps),
+            "project_path": project_path,
+            "metadata": dict(metadata or {}, log_count=len(self.log)),
+        })
+        if self._ckpt_thread is None or not self._ckpt_thread.is_alive():
+            self._ckpt_thread = threading.Thread(target=self._checkpoint_worker, daemon=True)
+            self._ckpt_thread.start()
+    
+    def _checkpoint_worker(self):
+        """Drain queued checkpoints to disk."""
+        while True:
+            job = self._ckpt_queue.get()
+            try:
+                checkpoint_manager.save_checkpoint(**job)
+                self._log(f"💾 Checkpoint saved at iteration {job['iteration']}")
+            except Exception as e:
+                self._log(f"⚠️ Checkpoint failed: {e}")
+            finally:
+                self._ckpt_queue.task_done()
     
     def _apply_pending_modifications(self):
         """Apply any modifications queued during pause."""
         if self.pending_modifications:
             self._log(f"📝 Applying {len(self.pending_modifications)} modifications")
+            # Consecutive removals are collected and applied in one pass over the plan
+            removals = Counter()
             for mod in self.pending_modifications:
                 # Parse modification string
+                if mod.startswith("remove:"):
+                    if mod[7:].strip():
+                        removals[mod[7:].strip()] += 1
+                    continue
+                self._remove_steps(removals)
                 if mod.startswith("add:"):
                     self.modify_plan("add", mod[4:].strip())
-                elif mod.startswith("remove:"):
-                    self.modify_plan("remove", mod[7:].strip())
+            self._remove_steps(removals)
             self.pending_modifications = []
     
+    def _remove_steps(self, counts: Counter):
+        """Remove the first counts[step] occurrences of each step from the plan, then clear counts."""
+        if not counts:
+            return
+        kept = []
+        for pending in recycler.pending_steps:
+            if counts[pending]:
+                counts[pending] -= 1
+                self._log(f"❌ Removed step: {pending}")
+            else:
+                kept.append(pending)
+        recycler.pending_steps[:] = kept
+        counts.clear()
+    
     def _log(self, msg: str):
         """Log with timestamp."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        entry = f"[{timestamp}] {msg}"
+        # Format the timestamp at most once per second (one tuple swap, safe across threads)
+        now = int(time.time())
+        ts = self._ts_cache
+        if ts[0] != now:
+            ts = self._ts_cache = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+        entry = f"[{ts[1]}] {msg}"
         self.log.append(entry)
+        _get_history_logger().info(entry)
+        
+        # Safe printing for Windows consoles: strip non-ascii only if stdout can't be switched to UTF-8
+        if not _console_ascii_only():
+            try:
+                print(entry)
+            except UnicodeEncodeError:
+                _console_ascii_fallback()
+        if _console_ascii_only():
+            print(entry.encode('ascii', 'ignore').decode('ascii'))
+        
+        # Flush for warnings/errors or once the interval has passed; step boundaries flush too
+        mono = time.monotonic()
+        if mono - self._last_console_flush >= CONSOLE_FLUSH_INTERVAL or _URGENT_LOG_RE.search(msg):
+            self._last_console_flush = mono
+            _flush_console()
         
-        # Safe printing for Windows consoles
-        try:
-            print(entry, flush=True)
-        except UnicodeEncodeError:
-            # Fallback: remove non-ascii chars if console can't handle them
-            safe_msg = msg.encode('ascii', 'ignore').decode('ascii')
-            safe_entry = f"[{timestamp}] {safe_msg}"
-            print(safe_entry, flush=True)
-            
         if self.progress_callback:
             self.progress_callback(msg)
     
-    def _call_llm(self, prompt: str, max_tokens: int = None) -> str:
-        """Make LLM call through base agent with optional token limit."""
-        from .base_agent import BaseAgent
-        from .config import TOKEN_LIMITS
-        
+    def _call_llm(self, prompt: str, max_tokens: int = None,
+                  on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """Make LLM call through base agent with optional token limit and chunk callback."""
         # Default to standard limit if not specified
         tokens = max_tokens or TOKEN_LIMITS["standard"]
         
-        class TempAgent(BaseAgent):
-            def __init__(self):
-                super().__init__("autonomous")
-            def _get_system_prompt(self):
-                return "You are Jarvis, an autonomous AI assistant completing a multi-step task."
-            def run(self, task: str) -> str:
-                return self.call_llm(task)
-        
-        agent = TempAgent()
-        return agent.call_llm(prompt, max_tokens=tokens)
+        if self._llm_agent is None:
+            self._llm_agent = _AutonomousLLMAgent()
+        return self._llm_agent.call_llm(prompt, max_tokens=tokens, on_chunk=on_chunk)
     
     def _check_completion(self, response: str) -> bool:
         """Check if task is complete based on EXPLICIT completion signal in response."""
-        # VERY SPECIFIC signals that the LLM must explicitly output
-        # Generic terms like "done" trigger false positives
-        completion_signals = [
-            "[task complete]",
-            "[all steps complete]",
-            "[project finished]",
-            "jarvis: task complete",
-            "=== task complete ===",
-            "[completion]",
-        ]
-        response_lower = response.lower()
-        
-        # Only trigger if signal appears at start of a line or is bracketed
-        for signal in completion_signals:
-            if signal in response_lower:
-                return True
-        
-        return False
+        # One case-insensitive scan for any of _COMPLETION_SIGNALS (no lowered copy of the response)
+        return bool(_COMPLETION_RE.search(response))
     
     def _verify_research_outputs(self, project_path: str, objective: str) -> dict:
         """
@@ -423,9 +1243,7 @@ class AutonomousExecutor:
         obj_lower = objective.lower()
         
         # Check if this is a research/algorithm task
-        is_research = any(kw in obj_lower for kw in [
-            "research", "algorithm", "paper", "academic", "benchmark", "novel"
-        ])
+        is_research = bool(_RESEARCH_TASK_RE.search(obj_lower))
         
         if not is_research:
             return {"verified": True, "issues": [], "verified_items": []}
@@ -511,38 +1329,22 @@ class AutonomousExecutor:
         """Validate output quality - reject placeholder-filled or incomplete content."""
         issues = []
         
-        # Check for common placeholders
-        placeholders = [
-            "[Company Name]", "[Your Name]", "[Your Company]",
-            "[specific initiative", "[TODO", "[PLACEHOLDER",
-            "[Company]", "[Name]", "[Contact]"
-        ]
-        
-        for p in placeholders:
-            if p in content:
-                issues.append(f"Contains placeholder: {p}")
+        # Check for common placeholders (one scan, reported in list order).
+        # Every placeholder starts with '[', so bracket-free content skips the regex.
+        if '[' in content:
+            found = set(_PLACEHOLDER_RE.findall(content))
+            for p in _PLACEHOLDERS:
+                if p in found:
+                    issues.append(f"Contains placeholder: {p}")
         
         # CODE-SPECIFIC QUALITY CHECKS
         if task_type == "coding":
             content_lower = content.lower()
             
             # Check for incomplete code markers
-            incomplete_markers = [
-                ("# TODO", "Contains TODO marker"),
-                ("// TODO", "Contains TODO marker"),
-                ("# FIXME", "Contains FIXME marker"),
-                ("// FIXME", "Contains FIXME marker"),
-                ("pass  # ", "Contains pass placeholder"),
-                ("...", "Contains ellipsis placeholder"),
-                ("# add more", "Contains 'add more' placeholder"),
-                ("// add more", "Contains 'add more' placeholder"),
-                ("# implement", "Contains 'implement' placeholder"),
-                ("// implement", "Contains 'implement' placeholder"),
-                ("raise NotImplementedError", "Contains NotImplementedError"),
-            ]
-            
-            for marker, issue in incomplete_markers:
-                if marker.lower() in content_lower:
+            found_markers = set(_INCOMPLETE_MARKER_RE.findall(content_lower))
+            for marker, issue in _INCOMPLETE_MARKERS:
+                if marker.lower() in found_markers:
                     issues.append(issue)
             
             # Check for very short code output (likely fragment)
@@ -574,65 +1376,15 @@ class AutonomousExecutor:
     
     def _detect_domain(self, content: str) -> str:
         """Detect which domain the content belongs to."""
-        content_lower = content.lower()
-        
-        if any(kw in content_lower for kw in ["react", "component", "jsx", "css", "html", "ui", "frontend", "page"]):
-            return "frontend"
-        elif any(kw in content_lower for kw in ["api", "route", "server", "endpoint", "express", "backend"]):
-            return "backend"
-        elif any(kw in content_lower for kw in ["database", "schema", "table", "sql", "supabase", "migration"]):
-            return "database"
-        elif any(kw in content_lower for kw in ["market", "competitor", "research", "trend", "analysis"]):
-            return "research"
-        else:
-            return "decisions"
+        return classify(content)["domain"]
     
     def _detect_task_type(self, objective: str) -> str:
         """
         Detect what type of task this is for appropriate handling.
         Supports coding, research, writing, analysis, and general tasks.
         """
-        obj_lower = objective.lower()
-        
-        # Coding tasks
-        coding_keywords = [
-            "build", "create", "develop", "code", "implement", "website", "app",
-            "frontend", "backend", "api", "component", "page", "feature",
-            "react", "python", "javascript", "html", "css", "database",
-            "deploy", "fix bug", "refactor", "landing page", "saas"
-        ]
-        if any(kw in obj_lower for kw in coding_keywords):
-            return "coding"
-        
-        # Research tasks
-        research_keywords = [
-            "research", "investigate", "find out", "look into", "analyze market",
-            "competitor analysis", "industry trends", "gather information",
-            "what is", "how does", "why do", "explore options"
-        ]
-        if any(kw in obj_lower for kw in research_keywords):
-            return "research"
-        
-        # Writing tasks
-        writing_keywords = [
-            "write", "draft", "compose", "create content", "blog post",
-            "article", "email", "pitch", "proposal", "documentation",
-            "copy", "script", "outline", "summary"
-        ]
-        if any(kw in obj_lower for kw in writing_keywords):
-            return "writing"
-        
-        # Analysis tasks
-        analysis_keywords = [
-            "analyze", "evaluate", "assess", "compare", "review",
-            "audit", "measure", "calculate", "forecast", "model",
-            "data analysis", "metrics", "performance"
-        ]
-        if any(kw in obj_lower for kw in analysis_keywords):
-            return "analysis"
-        
-        # Default to general
-        return "general"
+        # Tiers are checked in priority order: coding, research, writing, analysis
+        return classify(objective)["task_type"]
     
     def _detect_and_lock_project_type(self, objective: str) -> str:
         """
@@ -647,35 +1399,35 @@ class AutonomousExecutor:
         obj_lower = objective.lower()
         
         # Detect React/Frontend
-        if any(kw in obj_lower for kw in ['react', 'next.js', 'nextjs', 'vite', 'jsx', 'tsx', 'component', 'frontend app', 'web app']):
-            if not any(kw in obj_lower for kw in ['fastapi', 'flask', 'django', 'backend', 'api server']):
+        if _REACT_HINT_RE.search(obj_lower):
+            if not _BACKEND_FRAMEWORK_RE.search(obj_lower):
                 self.project_type = 'react'
                 self._log("🔒 PROJECT TYPE LOCKED: React Frontend")
         
         # Detect Python/Backend
-        elif any(kw in obj_lower for kw in ['python script', 'fastapi', 'flask', 'django', 'backend', 'cli tool', 'data processing']):
+        elif _PYTHON_HINT_RE.search(obj_lower):
             self.project_type = 'python'
             self._log("🔒 PROJECT TYPE LOCKED: Python")
         
         # Detect Research
-        elif any(kw in obj_lower for kw in ['research', 'algorithm', 'paper', 'benchmark', 'novel', 'academic']):
+        elif _RESEARCH_TASK_RE.search(obj_lower):
             self.project_type = 'research'
             self._log("🔒 PROJECT TYPE LOCKED: Research")
         
         # Detect Landing Page
-        elif any(kw in obj_lower for kw in ['landing page', 'static site', 'html page', 'marketing page']):
+        elif _LANDING_HINT_RE.search(obj_lower):
             self.project_type = 'landing'
             self._log("🔒 PROJECT TYPE LOCKED: Landing Page")
         
         # Detect Fullstack
-        elif any(kw in obj_lower for kw in ['fullstack', 'full-stack', 'full stack', 'frontend and backend']):
+        elif _FULLSTACK_HINT_RE.search(obj_lower):
             self.project_type = 'fullstack'
             self._log("🔒 PROJECT TYPE LOCKED: Fullstack")
         
         # Default: try to infer from common patterns
         else:
             # If mentions web but not backend, assume React
-            if any(kw in obj_lower for kw in ['web', 'app', 'ui', 'interface', 'page']) and not any(kw in obj_lower for kw in ['api', 'server', 'database']):
+            if _WEB_HINT_RE.search(obj_lower) and not _SERVER_HINT_RE.search(obj_lower):
                 self.project_type = 'react'
                 self._log("🔒 PROJECT TYPE LOCKED: React (inferred)")
             else:
@@ -691,8 +1443,7 @@ class AutonomousExecutor:
             return "component"
         
         # Look for [COMPONENT: Name] pattern
-        import re
-        component_match = re.search(r'\[COMPONENT[:\s]+([^\]]+)\]', step, re.IGNORECASE)
+        component_match = _COMPONENT_TAG_RE.search(step)
         if component_match:
             name = component_match.group(1).strip()
         else:
@@ -701,110 +1452,167 @@ class AutonomousExecutor:
         
         # Clean up the name for filesystem
         # Take first few meaningful words
-        words = re.findall(r'[a-zA-Z]+', name)
-        if words:
-            # Take up to 3 words, make lowercase, join with hyphen
-            clean_words = [w.lower() for w in words[:3] if len(w) > 2]
-            return "-".join(clean_words) if clean_words else "component"
-        
-        return "component"
+        # Take up to 3 words (matched lazily, not the whole step), make lowercase, join with hyphen
+        words = [m.group() for m in islice(_ALPHA_WORD_RE.finditer(name), 3)]
+        clean_words = [w.lower() for w in words if len(w) > 2]
+        return "-".join(clean_words) if clean_words else "component"
+    
+    def _prefetch_step_contexts(self, steps: List[str], task_type: str, project_path: str):
+        """Start retrieving context for upcoming steps while the current one runs."""
+        wanted = {(s, task_type, project_path) for s in steps[:self.context_prefetch_depth]}
+        
+        # Drop prefetches for steps that are no longer upcoming
+        for key in list(self._context_futures):
+            if key not in wanted:
+                self._context_futures.pop(key).cancel()
+        
+        if not wanted:
+            return
+        if self._prefetch_pool is None:
+            self._prefetch_pool = ThreadPoolExecutor(max_workers=self.context_prefetch_depth)
+        if self._prefetch_signature is None:
+            self._prefetch_signature = self._project_signature(project_path)
+        
+        for key in wanted:
+            if key not in self._context_futures:
+                step, agent, project = key
+                self._context_futures[key] = self._prefetch_pool.submit(
+                    get_context, step, agent=agent, project=project
+                )
+    
+    def _drop_stale_prefetches(self, project_path: str):
+        """
+        Cancel prefetched contexts if the project changed since they were started:
+        they were retrieved before the files of the steps in between existed.
+        """
+        if not self._context_futures:
+            self._prefetch_signature = None
+            return
+        signature = self._project_signature(project_path)
+        if signature != self._prefetch_signature:
+            for future in self._context_futures.values():
+                future.cancel()
+            self._context_futures.clear()
+        self._prefetch_signature = signature
+    
+    def _get_step_context(self, step: str, task_type: str, project_path: str, future=None) -> str:
+        """Use prefetched context for this step if available, otherwise fetch it now."""
+        if future is None:
+            future = self._context_futures.pop((step, task_type, project_path), None)
+        if future is not None and not future.cancelled():
+            try:
+                return future.result()
+            except Exception:
+                pass  # Fall back to a fresh fetch
+        return get_context(step, agent=task_type, project=project_path)
     
     def _route_to_specialist(self, step: str, task_type: str, project_path: str) -> Dict:
         """
         Route a step to the appropriate specialist agent.
         NOW USES: On-demand context retrieval (RAG-style) instead of pre-loading domains.
         """
-        step_lower = step.lower()
-        step_upper = step.upper()
-        
         # Get context on-demand using the new retriever
         # This asks the LLM which files are needed instead of pre-loading everything
-        context = get_context(step, agent=task_type, project=project_path)
-        
-        # === COMPONENT STEPS: Direct LLM for complete modules ===
-        if "[COMPONENT" in step_upper or "complete module" in step_lower:
-            return {
-                "agent": "component_builder", 
-                "category": "FRONTEND",
-                "use_specialist": False,
-                "context": context  # On-demand context instead of domains
-            }
+        context = self._get_step_context(step, task_type, project_path)
         
-        # === ARCHITECTURE STEPS: Direct LLM for design docs ===
-        if "[ARCHITECTURE" in step_upper or "system design" in step_lower:
-            return {
-                "agent": "architect",
-                "category": "ARCHITECTURE", 
-                "use_specialist": True,
-                "context": context
-            }
+        routing = self._classify_route(step)
+        routing["context"] = context  # On-demand context instead of domains
+        return routing
+    
+    def _classify_route(self, step: str) -> Dict:
+        """Pick agent and category for a step from its text alone (no context lookup)."""
+        found = classify(step)
         
-        # === INTEGRATION STEPS: Direct LLM for connecting modules ===
-        if "[INTEGRATION" in step_upper:
-            return {
-                "agent": "integrator",
-                "category": "FRONTEND",
-                "use_specialist": False,
-                "context": context
-            }
+        # === COMPONENT / ARCHITECTURE / INTEGRATION steps: fixed routes ===
+        if found["marker"]:
+            return dict(_MARKER_ROUTES[found["marker"]])
         
         # === Route by keywords to categories ===
-        routing_rules = {
-            "FRONTEND": {
-                "keywords": ["ui", "component", "page", "css", "style", "react", "animation", "frontend", "responsive"],
-                "default_agent": "frontend_dev"
-            },
-            "BACKEND": {
-                "keywords": ["api", "endpoint", "database", "auth", "backend", "server", "crud", "rest", "graphql"],
-                "default_agent": "backend_dev"
-            },
-            "RESEARCH": {
-                "keywords": ["research", "investigate", "find", "search", "analyze"],
-                "default_agent": "brute_researcher"
-            },
-            "ACADEMIC": {
-                "keywords": ["paper", "academic", "cite", "publication", "journal", "abstract", "methodology"],
-                "default_agent": "academic_research"
-            },
-            "QA": {
-                "keywords": ["test", "qa", "quality", "debug", "fix bug", "error", "lint", "review"],
-                "default_agent": "qa_agent"
-            },
-            "OPS": {
-                "keywords": ["deploy", "docker", "kubernetes", "ci/cd", "production", "github", "push", "git"],
-                "default_agent": "ops"
-            },
-            "CONTENT": {
-                "keywords": ["write", "document", "blog", "content", "seo", "readme", "article"],
-                "default_agent": "content_writer"
-            },
-            "PRESENTATION": {
-                "keywords": ["pitch", "deck", "slides", "presentation", "investor"],
-                "default_agent": "pitch_deck"
-            },
-            "BUSINESS": {
-                "keywords": ["requirements", "stakeholder", "user story", "business", "analysis", "specification"],
-                "default_agent": "business_analyst"
+        category = found["category"]
+        if category:
+            return {
+                "agent": _ROUTING_RULES[category]["default_agent"],
+                "category": category,
+                "use_specialist": True
             }
-        }
-        
-        # Match category
-        for category, config in routing_rules.items():
-            if any(kw in step_lower for kw in config["keywords"]):
-                return {
-                    "agent": config["default_agent"],
-                    "category": category,
-                    "use_specialist": True,
-                    "context": context  # On-demand context
-                }
         
         # Default: use LLM directly with minimal context
-        return {
-            "agent": "general",
-            "category": "CORE", 
-            "use_specialist": False,
-            "context": context
-        }
+        return {"agent": "general", "category": "CORE", "use_specialist": False}
+    
+    def _start_specialist_batch(self, step: str, routing: Dict, upcoming: List[str],
+                                task_type: str, project_path: str):
+        """
+        Start specialist calls for the next independent steps while this one runs
+        (only when specialist_batch_size > 1). A step joins the batch only if its
+        specialist is in _BATCHABLE_AGENTS, it isn't an [INTEGRATION] step, and its
+        category differs from every step already in flight. Its saves are deferred
+        until the step's turn comes.
+        """
+        # Drop batched work for steps that were removed from the plan
+        for key in list(self._specialist_futures):
+            if key[0] not in upcoming:
+                self._discard_specialist(key)
+        
+        if self.specialist_batch_size <= 1 or not routing["use_specialist"]:
+            return
+        
+        in_flight = {routing["category"]}
+        for nxt in upcoming[:self.specialist_batch_size - 1]:
+            key = (nxt, project_path)
+            if key in self._specialist_futures:
+                in_flight.add(self._classify_route(nxt)["category"])
+                continue
+            
+            nxt_routing = self._classify_route(nxt)
+            if (not nxt_routing["use_specialist"] or nxt_routing["agent"] not in _BATCHABLE_AGENTS
+                    or nxt_routing["category"] in in_flight or _INTEGRATION_TAG_RE.search(nxt)):
+                break
+            in_flight.add(nxt_routing["category"])
+            
+            if self._specialist_pool is None:
+                self._specialist_pool = ThreadPoolExecutor(max_workers=max(1, self.specialist_batch_size - 1))
+            self._log(f"  ⏩ Starting ahead ({nxt_routing['category']}): {nxt[:60]}")
+            # Hand over any prefetched context so the worker doesn't fetch it twice
+            context_future = self._context_futures.pop((nxt, task_type, project_path), None)
+            self._specialist_futures[key] = self._specialist_pool.submit(
+                self._run_specialist_ahead, nxt_routing["agent"], nxt, project_path, task_type, context_future
+            )
+    
+    def _run_specialist_ahead(self, agent_name: str, step: str, project_path: str,
+                              task_type: str, context_future=None) -> tuple:
+        """Worker: run a specialist without touching the project; returns (result, deferred saves)."""
+        saves = []
+        self._deferred_saves.sink = saves
+        try:
+            context = self._get_step_context(step, task_type, project_path, context_future)
+            return self._call_specialist(agent_name, step, project_path, context), saves
+        finally:
+            self._deferred_saves.sink = None
+    
+    def _finish_batched_step(self, future) -> str:
+        """Wait for a step started ahead and apply its deferred saves (executor thread)."""
+        response, deferred_saves = future.result()
+        for save, args in deferred_saves:
+            save(*args)
+        return response
+    
+    def _save_output(self, save, *args):
+        """Run a save now, or queue it when called from a run-ahead worker."""
+        sink = getattr(self._deferred_saves, "sink", None)
+        if sink is not None:
+            sink.append((save, args))
+            return None
+        return save(*args)
+    
+    def _discard_specialist(self, key):
+        """Forget a batched step: cancel it if not started; a running one's saves are never applied."""
+        future = self._specialist_futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+    
+    def _discard_all_specialists(self):
+        for key in list(self._specialist_futures):
+            self._discard_specialist(key)
     
     def _call_specialist(self, agent_name: str, step: str, project_path: str, context: str) -> str:
         """Call a specialist agent with the step and context."""
@@ -817,23 +1625,27 @@ class AutonomousExecutor:
             result = None
             
             if agent_name == "coder":
-                result = coder.run(step, project_path if os.path.exists(project_path) else None)
+                from .coder import coder
+                result = coder.run(step, project_path if self._path_exists(project_path) else None)
                 
             elif agent_name == "code_reviewer":
+                from .code_reviewer import code_reviewer
                 result = str(code_reviewer.run(project_path))
                 
             elif agent_name == "qa" or agent_name == "qa_agent":
                 result = str(qa_agent.run(project_path))
                 
             elif agent_name == "security":
+                from .security_auditor import security_auditor
                 result = str(security_auditor.run(project_path))
                 
             elif agent_name == "research" or agent_name == "brute_researcher":
                 # Research agent - returns text content
+                from .brute_research import brute_researcher
                 result = str(brute_researcher.run(step))
                 # Save research to docs
                 if result and len(result) > 100:
-                    self._save_research_doc(result, project_path, step)
+                    self._save_output(self._save_research_doc, result, project_path, step)
                 
             elif agent_name == "frontend_dev":
                 # Frontend development - generate and save code
@@ -843,7 +1655,7 @@ class AutonomousExecutor:
                 result = frontend_dev.run(step, project_context=file_context)
                 # Extract and save any code blocks
                 if result:
-                    self._extract_and_save_code(result, project_name)
+                    self._save_output(self._extract_and_save_code, result, project_name)
                 
             elif agent_name == "backend_dev":
                 # Backend development - generate and save code
@@ -853,28 +1665,28 @@ class AutonomousExecutor:
                 result = backend_dev.run(step, project_context=file_context)
                 # Extract and save any code blocks
                 if result:
-                    self._extract_and_save_code(result, project_name)
+                    self._save_output(self._extract_and_save_code, result, project_name)
                 
             elif agent_name == "content_writer":
                 # Content writing - save to docs
                 from .content_writer import content_writer
                 result = content_writer.run(step)
                 if result and len(result) > 100:
-                    self._save_content_doc(result, project_path, step)
+                    self._save_output(self._save_content_doc, result, project_path, step)
                 
             elif agent_name == "architect":
                 # Architecture - save design docs
                 from .architect import architect
                 result = architect.run(step)
                 if result and len(result) > 100:
-                    self._save_architecture_doc(result, project_path, step)
+                    self._save_output(self._save_architecture_doc, result, project_path, step)
                     
             elif agent_name == "ops":
                 # DevOps agent
                 from .ops import ops
                 result = ops.run(step)
                 if result:
-                    self._extract_and_save_code(result, project_name)
+                    self._save_output(self._extract_and_save_code, result, project_name)
             
             # === NEW AGENT HANDLERS ===
             
@@ -883,21 +1695,21 @@ class AutonomousExecutor:
                 from .academic_research import academic_research
                 result = academic_research.run(step)
                 if result and len(result) > 100:
-                    self._save_research_doc(result, project_path, step)
+                    self._save_output(self._save_research_doc, result, project_path, step)
             
             elif agent_name == "pitch_deck":
                 # Presentation generation
                 from .pitch_deck import pitch_deck
                 result = pitch_deck.run(step)
                 if result:
-                    self._save_content_doc(result, project_path, step)
+                    self._save_output(self._save_content_doc, result, project_path, step)
             
             elif agent_name == "business_analyst":
                 # Business requirements and analysis
                 from .business_analyst import business_analyst
                 result = business_analyst.run(step)
                 if result and len(result) > 100:
-                    self._save_architecture_doc(result, project_path, step)
+                    self._save_output(self._save_architecture_doc, result, project_path, step)
             
             elif agent_name == "git_agent":
                 # Git operations
@@ -914,7 +1726,7 @@ class AutonomousExecutor:
                 result = self._call_llm(f"Execute this step: {step}\n\nContext: {context[:2000]}")
                 # Still try to extract and save any code from response
                 if result:
-                    self._extract_and_save_code(result, project_name)
+                    self._save_output(self._extract_and_save_code, result, project_name)
             
             return result or ""
                 
@@ -924,7 +1736,7 @@ class AutonomousExecutor:
             result = self._call_llm(f"Execute this step: {step}\n\nContext: {context[:2000]}")
             # Try to extract code even from fallback
             if result:
-                self._extract_and_save_code(result, project_name)
+                self._save_output(self._extract_and_save_code, result, project_name)
             return result or ""
     
     def _get_project_context(self, project_path: str, task: str = "") -> str:
@@ -932,7 +1744,7 @@ class AutonomousExecutor:
         Get smart codebase context for the current task.
         Uses code_indexer for intelligent context extraction.
         """
-        if not project_path or not os.path.exists(project_path):
+        if not project_path or not self._path_exists(project_path):
             return ""
         
         try:
@@ -1039,7 +1851,6 @@ class AutonomousExecutor:
         - Asks LLM to fix any remaining issues
         - Verifies all imports work
         """
-        import os
         import subprocess
         
         result = {
@@ -1124,17 +1935,18 @@ class AutonomousExecutor:
         
         return result
     
-    def _extract_and_save_code(self, result: str, project_name: str) -> List[str]:
+    def _extract_and_save_code(self, result: str, project_name: str, early: bool = False) -> List[str]:
         """
         Extract code blocks from LLM output and save to proper files.
         Handles both:
         1. Code blocks with explicit filenames: ```jsx filename="App.jsx"
         2. Concatenated code with comment markers: // src/components/Sidebar.tsx
+        early=True is a mid-stream save of one block: files are written only, marker
+        splitting is left to the final pass and the file index isn't touched.
         """
-        import re
-        import os
-        
         saved_files = []
+        seen_hashes = set()  # Identical blocks restated within this response
+        writes = {}  # full_path -> (relative path, content); flushed together at the end
         
         # Get or create project using project_builder
         if not project_builder.project_path or project_name not in str(project_builder.project_path or ""):
@@ -1145,22 +1957,23 @@ class AutonomousExecutor:
         project_path = project_builder.project_path
         
         # FIRST: Try to split by comment markers (// src/filename.ext or # src/filename.ext)
-        file_pattern = r'(?:\/\/|#)\s*(src\/[^\n]+\.(?:tsx?|jsx?|css|py|json|md))\s*\n'
-        splits = re.split(file_pattern, result)
+        # Each file body runs from the end of its marker to the start of the next one
+        markers = list(_FILE_SPLIT_RE.finditer(result))
+        if markers and early:
+            return []
         
-        if len(splits) > 2:
+        if markers:
             # We have comment-based splits
-            self._log(f"  -> Detected {len(splits)//2} embedded files")
-            i = 1
-            while i < len(splits) - 1:
-                filename = splits[i].strip()
-                content = splits[i + 1].strip()
+            self._log(f"  -> Detected {len(markers)} embedded files")
+            for idx, marker in enumerate(markers):
+                body_end = markers[idx + 1].start() if idx + 1 < len(markers) else len(result)
+                filename = marker.group(1).strip()
+                content = result[marker.end():body_end].strip()
                 
                 # === V4.0: JUNK FILE FILTER ===
                 basename = os.path.basename(filename)
                 if basename in self.junk_files:
                     self._log(f"  -> SKIPPED JUNK: {filename} (stdlib reimplementation)")
-                    i += 2
                     continue
                 
                 # Clean up content - remove trailing ```
@@ -1173,28 +1986,26 @@ class AutonomousExecutor:
                     content = lines[1] if len(lines) > 1 else ""
                 
                 if content and filename:
+                    block_hash = self._content_digest(filename, content)
+                    if block_hash in seen_hashes:
+                        continue
+                    seen_hashes.add(block_hash)
+                    
                     full_path = os.path.join(project_path, filename)
-                    os.makedirs(os.path.dirname(full_path), exist_ok=True)
                     
                     # V4.4: SMART OVERWRITE PROTECTION for markdown files
                     if not self._should_overwrite_file(full_path, content):
                         self._log(f"  ⚠️ SKIP: Won't overwrite {filename} with lower quality content")
-                        i += 2
                         continue
                     
-                    with open(full_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
-                    
+                    writes[full_path] = (filename, content)
                     saved_files.append(filename)
-                    self._log(f"  -> Saved: {filename} ({len(content)} chars)")
-                
-                i += 2
             
+            self._flush_writes(writes)
             return saved_files
         
         # SECOND: Try explicit filename in code blocks
-        code_pattern = r'```(\w+)(?:\s+filename=["\']([^"\']+)["\'])?\n([\s\S]*?)```'
-        matches = re.findall(code_pattern, result)
+        matches = _CODE_BLOCK_RE.findall(result)
         
         if matches:
             for lang, filename, code in matches:
@@ -1204,21 +2015,26 @@ class AutonomousExecutor:
                 if not code:
                     continue
                 
+                # Skip blocks the LLM restated verbatim in the same response
+                block_hash = self._content_digest(lang, filename, code)
+                if block_hash in seen_hashes:
+                    continue
+                seen_hashes.add(block_hash)
+                
                 # FIRST: Try to extract filename from first line comment
                 # Matches: // src/file.js, # backend/file.py, /* src/styles.css */
-                first_line = code.split('\n')[0].strip()
+                first_line = code.partition('\n')[0].strip()
                 extracted_filename = None
                 
                 # Pattern for // or # comments with path
-                comment_file_match = re.search(r'^(?://|#|\*/?\*?)\s*([a-zA-Z0-9_/.-]+\.[a-zA-Z]+)', first_line)
+                comment_file_match = _FILE_COMMENT_RE.search(first_line)
                 if comment_file_match:
                     potential_file = comment_file_match.group(1)
                     # Validate it looks like a real file path
                     if '/' in potential_file or potential_file.endswith(('.py', '.js', '.jsx', '.tsx', '.css', '.html')):
                         extracted_filename = potential_file
                         # Remove the filename comment from code
-                        code_lines = code.split('\n')
-                        code = '\n'.join(code_lines[1:]).strip()
+                        code = code.partition('\n')[2].strip()
                 
                 # Determine target file - SMART ROUTING based on content
                 if extracted_filename:
@@ -1268,9 +2084,8 @@ class AutonomousExecutor:
                             target_file = 'scripts/analysis.py'
                         else:
                             # Default Python file - use descriptive name based on first function/class
-                            import re as re_inner
-                            func_match = re_inner.search(r'def (\w+)', code)
-                            class_match = re_inner.search(r'class (\w+)', code)
+                            func_match = _DEF_NAME_RE.search(code)
+                            class_match = _CLASS_NAME_RE.search(code)
                             if class_match:
                                 target_file = f"backend/{class_match.group(1).lower()}.py"
                             elif func_match and func_match.group(1) != 'main':
@@ -1289,30 +2104,13 @@ class AutonomousExecutor:
                         target_file = f'src/generated.{lang}'
                 
                 full_path = os.path.join(project_path, target_file)
-                os.makedirs(os.path.dirname(full_path), exist_ok=True)
-                
-                # CRITICAL: Prevent creating files that shadow Python packages!
-                FORBIDDEN_FILENAMES = {
-                    # Python stdlib
-                    'base64', 'json', 'os', 'sys', 'io', 're', 'typing', 'datetime', 
-                    'time', 'math', 'random', 'hashlib', 'secrets', 'contextlib',
-                    'collections', 'functools', 'itertools', 'sqlite3', 'urllib',
-                    # Common pip packages - DO NOT SHADOW THESE
-                    'passlib', 'sqlalchemy', 'jose', 'jwt', 'pydantic', 'fastapi',
-                    'flask', 'requests', 'httpx', 'aiohttp', 'numpy', 'pandas',
-                    'cryptography', 'bcrypt', 'dotenv', 'redis', 'celery',
-                    'pytest', 'unittest', 'logging', 'asyncio', 'threading',
-                    'multiprocessing', 'subprocess', 'pathlib', 'shutil', 'glob',
-                    # Also catch variations
-                    'pyjwt', 'python-jose', 'python-dotenv', 'psycopg2', 'pymongo'
-                }
                 
-                # Check if target filename (without extension) is in forbidden list
+                # Check if target filename (without extension) shadows a stdlib module or package
                 base_name = os.path.basename(target_file).rsplit('.', 1)[0].lower()
                 full_filename = os.path.basename(target_file)
                 
                 # === V4.0: SKIP junk files entirely, don't rename them ===
-                if base_name in FORBIDDEN_FILENAMES or full_filename in self.junk_files:
+                if base_name in _FORBIDDEN_FILENAMES or full_filename in self.junk_files:
                     self._log(f"  -> SKIPPED JUNK: {target_file} (would shadow stdlib/package)")
                     continue
                 
@@ -1324,14 +2122,13 @@ class AutonomousExecutor:
                     self._log(f"  ⚠️ SKIP: Won't overwrite {target_file} with lower quality content")
                     continue
                 
-                with open(full_path, 'w', encoding='utf-8') as f:
-                    f.write(code)
-                
+                writes[full_path] = (target_file, code)
                 saved_files.append(target_file)
-                self._log(f"  -> Saved: {target_file} ({len(code)} chars)")
+        
+        self._flush_writes(writes)
         
         # Update file index for context in subsequent steps
-        if saved_files and project_path:
+        if saved_files and project_path and not early:
             try:
                 self._update_file_index(os.path.basename(project_path), saved_files)
             except Exception as e:
@@ -1339,38 +2136,186 @@ class AutonomousExecutor:
         
         return saved_files
     
-    def _update_file_index(self, project_name: str, files: List[str]):
-        """Track generated files in an index for the AI to reference."""
-        from .config import WORKSPACE_DIR
+    def _save_streamed_block(self, block: str, project_name: str):
+        """
+        Save one just-closed code block while the LLM is still generating.
+        Only blocks that name their file are saved early, since unnamed blocks are
+        routed by the whole response; no early saves happen once the response uses
+        file markers (see _FenceStream). The full response is still extracted
+        afterwards and identical content is not rewritten (see _write_if_changed).
+        """
+        header, _, body = block.partition('\n')
+        first_line = body.lstrip().split('\n', 1)[0].strip()
+        comment_file = _FILE_COMMENT_RE.search(first_line)
+        named = 'filename=' in header or (comment_file and '/' in comment_file.group(1))
+        if not named:
+            return
         
-        index_path = os.path.join(WORKSPACE_DIR, project_name, ".file_index.json")
+        try:
+            for filename in self._extract_and_save_code(block, project_name, early=True):
+                live_logger.file_saved(filename)
+        except Exception as e:
+            self._log(f"  ⚠️ Early save skipped: {e}")
+    
+    def _flush_writes(self, writes: Dict[str, tuple]):
+        """Write buffered files: one makedirs per unique directory, one summary log line."""
+        if not writes:
+            return
+        
+        for directory in {os.path.dirname(full_path) for full_path in writes}:
+            if directory not in self._existing_paths:
+                os.makedirs(directory, exist_ok=True)
+                self._existing_paths.add(directory)
+        
+        written, unchanged, total_chars = [], [], 0
+        for full_path, (relative_path, content) in writes.items():
+            if self._write_if_changed(full_path, content):
+                written.append(relative_path)
+                total_chars += len(content)
+            else:
+                unchanged.append(relative_path)
         
-        # Load existing index
-        existing = []
-        if os.path.exists(index_path):
+        if written:
+            self._log(f"  -> Saved {len(written)} files ({total_chars} chars): {', '.join(written)}")
+        if unchanged:
+            self._log(f"  -> Unchanged: {', '.join(unchanged)}")
+    
+    @staticmethod
+    def _content_digest(*parts: str) -> bytes:
+        """Short BLAKE2b digest used to spot duplicate code blocks."""
+        h = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            h.update(part.encode('utf-8', errors='replace'))
+            h.update(b'\0')
+        return h.digest()
+    
+    def _path_exists(self, path: str) -> bool:
+        """
+        os.path.exists that remembers hits for the run. Misses are re-checked,
+        since project dirs and files appear mid-run but are not deleted by it.
+        """
+        if path in self._existing_paths:
+            return True
+        if os.path.exists(path):
+            self._existing_paths.add(path)
+            return True
+        return False
+    
+    def _stat_key(self, path: str) -> Optional[tuple]:
+        """(mtime_ns, size) of path, or None if it can't be stat'ed."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
+    def _compiled_unchanged(self, path: str) -> bool:
+        """True if path compiled cleanly before and hasn't changed since."""
+        key = self._compiled_ok.get(path)
+        return key is not None and key == self._stat_key(path)
+    
+    def _read_source(self, path: str) -> str:
+        """Read a UTF-8 source file, reusing the last read while the file is unchanged."""
+        key = self._stat_key(path)
+        cached = self._source_cache.get(path)
+        if cached and key is not None and cached[0] == key:
+            return cached[1]
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        self._source_cache[path] = (key, text)
+        return text
+    
+    def _write_if_changed(self, full_path: str, content: str) -> bool:
+        """
+        Write content unless this executor already wrote the identical content
+        to full_path and the file hasn't been touched since. Returns True if written.
+        """
+        # Encode once: the same bytes are hashed and written
+        data = content.encode('utf-8')
+        if os.linesep != '\n':
+            data = data.replace(b'\n', os.linesep.encode())  # Same newlines as a text-mode write
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        previous = self._written_digests.get(full_path)
+        if previous and previous[0] == digest:
             try:
-                import json
-                with open(index_path, 'r') as f:
-                    existing = json.load(f)
-            except:
-                existing = []
+                if os.stat(full_path).st_mtime_ns == previous[1]:
+                    return False
+            except OSError:
+                pass
+        
+        # Unbuffered write of the pre-encoded bytes (no text/buffer wrapper per file)
+        fd = os.open(full_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        
+        try:
+            self._written_digests[full_path] = (digest, os.stat(full_path).st_mtime_ns)
+        except OSError:
+            self._written_digests.pop(full_path, None)
+        return True
+    
+    def _update_file_index(self, project_name: str, files: List[str]):
+        """Track generated files in an append-only index for the AI to reference."""
+        index_path = os.path.join(WORKSPACE_DIR, project_name, ".file_index.jsonl")
         
-        # Add new files
+        seen = self._file_index_seen.get(index_path)
+        if seen is None:
+            seen = self._load_file_index(index_path)
+            self._file_index_seen[index_path] = seen
+        
+        # Only append files not already in the index
+        new_files = []
         for f in files:
-            if f not in existing:
-                existing.append(f)
+            if f not in seen:
+                seen.add(f)
+                new_files.append(f)
         
-        # Save updated index
-        import json
-        with open(index_path, 'w') as f:
-            json.dump(existing, f, indent=2)
+        if new_files:
+            with open(index_path, 'a', encoding='utf-8') as fh:
+                fh.writelines(json.dumps({"f": f}) + "\n" for f in new_files)
+    
+    def _load_file_index(self, index_path: str) -> set:
+        """Read the .jsonl file index, converting a legacy .json index once if present."""
+        seen = set()
+        if os.path.exists(index_path):
+            line = "\n"
+            with open(index_path, 'r', encoding='utf-8') as fh:
+                for line in fh:
+                    try:
+                        seen.add(json.loads(line)["f"])
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Skip torn/corrupt lines
+            if not line.endswith("\n"):
+                # Terminate a torn last line so the next append starts cleanly
+                with open(index_path, 'a', encoding='utf-8') as fh:
+                    fh.write("\n")
+        
+        legacy_path = index_path[:-1]  # .file_index.json
+        if os.path.exists(legacy_path):
+            try:
+                with open(legacy_path, 'r', encoding='utf-8') as fh:
+                    legacy = json.load(fh)
+                if not isinstance(legacy, list):
+                    raise ValueError("legacy index is not a list")
+                missing = [f for f in legacy if isinstance(f, str) and f not in seen]
+                with open(index_path, 'a', encoding='utf-8') as fh:
+                    fh.writelines(json.dumps({"f": f}) + "\n" for f in missing)
+                seen.update(missing)
+                os.remove(legacy_path)  # Only once its entries are safely in the .jsonl
+            except (OSError, ValueError) as e:
+                self._log(f"⚠️ Kept legacy file index {legacy_path}: {e}")
+        
+        return seen
     
     def _clean_code_output(self, code: str, filename: str) -> str:
         """
         V4.2: Strip prose/explanations that LLM may have added to code.
         Hermes sometimes adds chat-like responses after code.
         """
-        import re
         
         lines = code.split('\n')
         clean_lines = []
@@ -1413,7 +2358,6 @@ class AutonomousExecutor:
         V4.4: Smart overwrite protection.
         Prevents overwriting good content with stubs or placeholders.
         """
-        import os
         
         # If file doesn't exist, always allow
         if not os.path.exists(filepath):
@@ -1460,7 +2404,6 @@ class AutonomousExecutor:
         V4.4: Detect if content has quality issues (placeholders, stubs).
         Returns True if content has problems.
         """
-        import re
         
         # Placeholder patterns
         placeholder_patterns = [
@@ -1493,67 +2436,110 @@ class AutonomousExecutor:
         
         return False
     
+    def _stream_process_output(self, proc, prefix: str, tail, quiet=None):
+        """
+        Forward a subprocess's output to the log line by line, keeping only a short tail.
+        Once the optional `quiet` event is set, lines only go to the tail.
+        """
+        def pump():
+            try:
+                for line in proc.stdout:
+                    line = line.rstrip()
+                    if line:
+                        tail.append(line)
+                        if quiet is None or not quiet.is_set():
+                            self._log(f"{prefix} {line}")
+            except (ValueError, OSError):
+                pass  # Pipe closed
+        
+        reader = threading.Thread(target=pump, daemon=True)
+        reader.start()
+        return reader
+    
     def _auto_run_project(self, project_path: str) -> Dict:
         """
         Automatically install dependencies and start dev server.
+        Output is streamed to the log as it arrives.
         Returns: Dict with status, port, and any errors.
         """
         import subprocess
-        import time
         
         result = {"success": False, "port": None, "error": None, "process": None}
         
         # Check if package.json exists
         package_json = os.path.join(project_path, "package.json")
-        if not os.path.exists(package_json):
+        if not self._path_exists(package_json):
             result["error"] = "No package.json found"
             return result
         
         self._log("[AutoRun] Installing dependencies...")
         
         try:
-            # Run npm install
-            install_result = subprocess.run(
-                ["npm", "install"],
+            # Run npm install, streaming output instead of buffering it all
+            install_tail = deque(maxlen=20)
+            install_process = subprocess.Popen(
+                _npm_cmd("install"),
                 cwd=project_path,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                timeout=300,  # 5 min timeout
-                shell=True
+                bufsize=1
             )
+            reader = self._stream_process_output(install_process, "[npm install]", install_tail)
+            
+            deadline = time.monotonic() + 300  # 5 min timeout
+            while install_process.poll() is None:
+                if time.monotonic() > deadline or self._cancel.is_set():
+                    install_process.terminate()
+                    try:
+                        install_process.wait(timeout=10)
+                    except subprocess.TimeoutExpired:
+                        install_process.kill()
+                    result["error"] = "npm install cancelled" if self._cancel.is_set() else "npm install timed out"
+                    self._log(f"[AutoRun] {result['error']}")
+                    return result
+                self._cancel.wait(0.5)  # Returns at once on stop()
+            reader.join(timeout=5)
             
-            if install_result.returncode != 0:
-                result["error"] = f"npm install failed: {install_result.stderr[:500]}"
-                self._log(f"[AutoRun] npm install failed: {install_result.stderr[:200]}")
+            if install_process.returncode != 0:
+                output = "\n".join(install_tail)
+                result["error"] = f"npm install failed: {output[-500:]}"
+                self._log(f"[AutoRun] npm install failed: {output[-200:]}")
                 return result
             
             self._log("[AutoRun] Dependencies installed. Starting dev server...")
             
-            # Start dev server in background
+            # Start dev server in background; keep draining its output so the pipe never fills
+            dev_tail = deque(maxlen=20)
             dev_process = subprocess.Popen(
-                ["npm", "run", "dev"],
+                _npm_cmd("run", "dev"),
                 cwd=project_path,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                shell=True
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1
             )
+            # Only startup output is logged; a long-running server would flood the log
+            dev_quiet = threading.Event()
+            dev_reader = self._stream_process_output(dev_process, "[dev server]", dev_tail, quiet=dev_quiet)
             
-            # Wait a bit for server to start
-            time.sleep(5)
+            # Give the server a few seconds to start (bail out early if it crashes)
+            deadline = time.monotonic() + 5
+            while dev_process.poll() is None and time.monotonic() < deadline:
+                time.sleep(0.25)
             
             # Check if process is still running
             if dev_process.poll() is None:
+                dev_quiet.set()
                 result["success"] = True
                 result["port"] = 5173  # Vite default
                 result["process"] = dev_process
                 self._log(f"[AutoRun] ✅ Dev server running on port {result['port']}")
             else:
-                stdout, stderr = dev_process.communicate()
-                result["error"] = f"Dev server crashed: {stderr.decode()[:500]}"
+                dev_reader.join(timeout=2)  # Collect the output up to the crash
+                result["error"] = f"Dev server crashed: {chr(10).join(dev_tail)[-500:]}"
                 self._log(f"[AutoRun] ❌ Dev server failed")
             
-        except subprocess.TimeoutExpired:
-            result["error"] = "npm install timed out"
         except Exception as e:
             result["error"] = str(e)
             self._log(f"[AutoRun] Error: {e}")
@@ -1604,12 +2590,23 @@ class AutonomousExecutor:
             screenshot_path = os.path.join(WORKSPACE_DIR, "screenshots", f"preview_{int(time.time())}.png")
             os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
             
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page(viewport={"width": 1280, "height": 720})
-                page.goto(f"http://localhost:{port}", wait_until="networkidle", timeout=30000)
-                page.screenshot(path=screenshot_path)
-                browser.close()
+            browser = _get_preview_browser()
+            if browser is not None:
+                # Reuse the running browser; a fresh context per capture keeps pages isolated
+                browser_context = browser.new_context(viewport={"width": 1280, "height": 720})
+                try:
+                    page = browser_context.new_page()
+                    _load_preview_page(page, f"http://localhost:{port}")
+                    page.screenshot(path=screenshot_path)
+                finally:
+                    browser_context.close()
+            else:
+                with sync_playwright() as p:
+                    browser = p.chromium.launch(headless=True)
+                    page = browser.new_page(viewport={"width": 1280, "height": 720})
+                    _load_preview_page(page, f"http://localhost:{port}")
+                    page.screenshot(path=screenshot_path)
+                    browser.close()
             
             self._log(f"[Preview] Screenshot saved: {screenshot_path}")
             return screenshot_path
@@ -1623,81 +2620,54 @@ class AutonomousExecutor:
         Scan saved Python files for local imports and verify they exist.
         Returns a list of missing module names (only if they are NOT installed packages).
         """
-        import re
         import importlib.util
-        import sys
-        
-        missing = []
-        # Pre-populate with known builtins and common libs to save time
-        ignored_modules = set(sys.builtin_module_names) | {
-            'os', 'sys', 'json', 'time', 'datetime', 're', 'random', 
-            'math', 'collections', 'itertools', 'functools', 'typing',
-            'pathlib', 'subprocess', 'threading', 'multiprocessing',
-            'requests', 'numpy', 'pandas', 'networkx', 'matplotlib',
-            'pydantic', 'fastapi', 'sqlalchemy', 'uvicorn', 'sqlite3',
-            'asyncio', 'contextlib', 'shutil', 'logging', 'uuid', 'types',
-            'copy', 'enum', 'hashlib', 'base64', 'io', 'platform', 'mock',
-            'pytest', 'unittest', 'dataclasses', 'abc', 'argparse'
-        }
         
-        for filename in saved_files:
-            if not filename.endswith('.py'):
-                continue
-            
-            # Find the file path
-            filepath = None
-            for root, dirs, files in os.walk(project_path):
-                if filename in files:
-                    filepath = os.path.join(root, filename)
-                    break
-            
-            if not filepath or not os.path.exists(filepath):
+        missing = {}  # Insertion-ordered set of missing modules
+        # Stdlib, installed packages and common libs never count as missing
+        ignored_modules = set(_known_modules())
+        
+        # One walk of the project: file name -> first path found
+        file_index = _project_file_index(project_path)
+        
+        # Read and parse files concurrently; resolve modules in order on this thread
+        jobs = [(filename, file_index[filename]) for filename in saved_files
+                if filename.endswith('.py') and filename in file_index]
+        scanned = []
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(AUDIT_WORKERS, len(jobs))) as pool:
+                scanned = list(pool.map(_scan_file_imports, jobs))
+        
+        for (filename, _), (module_names, error) in zip(jobs, scanned):
+            if error:
+                self._log(f"[DependencyAudit] Error parsing {filename}: {error}")
                 continue
             
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Parse import statements
-                # Match: import X, from X import Y
-                import_pattern = r'^(?:from\s+(\w+)|import\s+(\w+))'
-                for match in re.finditer(import_pattern, content, re.MULTILINE):
-                    module_name = match.group(1) or match.group(2)
-                    
-                    if not module_name:
-                        continue
-                    
-                    # 1. Check whitelist
-                    if module_name in ignored_modules:
-                        continue
-                        
-                    # 2. Check installed packages (safe check)
-                    try:
-                        spec = importlib.util.find_spec(module_name)
-                        if spec is not None:
-                            ignored_modules.add(module_name) # Cache it
-                            continue
-                    except Exception:
-                        pass
-                    
-                    # 3. Check if local module exists (file in project)
-                    local_found = False
-                    for root, _, files in os.walk(project_path):
-                        if f"{module_name}.py" in files:
-                            local_found = True
-                            break
+            for module_name in module_names:
+                if not module_name:
+                    continue
+                
+                # 1. Check whitelist (and modules already resolved in this audit)
+                if module_name in ignored_modules or module_name in missing:
+                    continue
                     
-                    if local_found:
+                # 2. Check installed packages (safe check)
+                try:
+                    spec = importlib.util.find_spec(module_name)
+                    if spec is not None:
+                        ignored_modules.add(module_name) # Cache it
                         continue
-                    
-                    # If we reach here, it's truly missing
-                    if module_name not in missing:
-                        missing.append(module_name)
-                        
-            except Exception as e:
-                self._log(f"[DependencyAudit] Error parsing {filename}: {e}")
+                except Exception:
+                    pass
+                
+                # 3. Check if local module exists (file in project)
+                if f"{module_name}.py" in file_index:
+                    ignored_modules.add(module_name)
+                    continue
+                
+                # If we reach here, it's truly missing
+                missing[module_name] = None
         
-        return missing
+        return list(missing)
     
     def _validate_execution(self, project_path: str, saved_files: list) -> dict:
         """
@@ -1710,28 +2680,29 @@ class AutonomousExecutor:
         
         # Only validate entry points for import, skip helper files
         entry_points = {'main.py', 'app.py', 'server.py', 'index.py'}
+        file_index = _project_file_index(project_path)
         
         for filename in saved_files:
             if not filename.endswith('.py'):
                 continue
             
             # Find the file path
-            filepath = None
-            for root, dirs, files in os.walk(project_path):
-                if filename in files:
-                    filepath = os.path.join(root, filename)
-                    break
+            filepath = file_index.get(filename)
             
             if not filepath or not os.path.exists(filepath):
                 continue
             
+            if self._compiled_unchanged(filepath):
+                continue  # Already passed, untouched since
+            
             try:
                 # Only check SYNTAX (compile), don't try to import
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    code = f.read()
+                key = self._stat_key(filepath)
+                code = self._read_source(filepath)
                 
                 # Compile to check syntax ONLY
                 compile(code, filepath, 'exec')
+                self._compiled_ok[filepath] = key
                 self._log(f"[Validation] ✅ {filename}: Syntax OK")
                     
             except SyntaxError as e:
@@ -1757,25 +2728,20 @@ class AutonomousExecutor:
         if critique.get("issues"):
             issues.extend([{"perspective": "correctness", **i} for i in critique["issues"]])
         
+        # One scan counts every security flag and performance hint
+        hits = Counter(_REVIEW_SCAN_RE.findall(code))
+        
         # Perspective 2: Security (quick static checks)
-        security_red_flags = [
-            ("eval(", "CRITICAL: Use of eval() is dangerous"),
-            ("exec(", "CRITICAL: Use of exec() is dangerous"),
-            ("__import__", "WARNING: Dynamic import detected"),
-            ("pickle.load", "WARNING: Pickle deserialization can be unsafe"),
-            ("shell=True", "WARNING: Shell injection risk with subprocess"),
-            ("os.system(", "WARNING: Prefer subprocess over os.system"),
-        ]
-        for pattern, warning in security_red_flags:
-            if pattern in code:
+        for pattern, warning in _SECURITY_RED_FLAGS:
+            if hits[pattern]:
                 issues.append({"perspective": "security", "title": warning, "risk": "major"})
         
         # Perspective 3: Performance (basic checks)
         perf_issues = []
-        if "for " in code and "append(" in code:
+        if hits["for "] and hits["append("]:
             # Suggest list comprehension
             perf_issues.append("Consider list comprehension instead of for+append")
-        if code.count("for ") > 5:
+        if hits["for "] > 5:
             perf_issues.append("Multiple nested loops detected - consider optimization")
         
         for issue in perf_issues:
@@ -1785,12 +2751,12 @@ class AutonomousExecutor:
     
     def _get_project_name(self, objective: str) -> str:
         """Generate a project folder name from the objective."""
-        import re
-        # Extract key words and create short name
-        words = re.findall(r'\b\w+\b', objective.lower())
-        keywords = [w for w in words if len(w) > 3 and w not in ['build', 'create', 'make', 'with', 'that', 'this', 'from', 'using']]
-        name = '-'.join(keywords[:3]) if keywords else 'project'
-        return name.replace(' ', '-')[:30]
+        return _project_name_for(objective)
+    
+    def _project_location(self, objective: str) -> tuple:
+        """(project name, project path under WORKSPACE_DIR/projects) for an objective."""
+        project_name = self._get_project_name(objective)
+        return project_name, os.path.join(WORKSPACE_DIR, "projects", project_name)
     
     def _scaffold_project(self, project_path: str, project_type: str = "research") -> dict:
         """
@@ -1806,10 +2772,11 @@ class AutonomousExecutor:
         
         folders = structure.get(project_type, structure["default"])
         created = {"folders": [], "files": []}
+        existing = _dir_entries(project_path)
         
         for folder in folders:
             folder_path = os.path.join(project_path, folder)
-            if not os.path.exists(folder_path):
+            if folder not in existing:
                 os.makedirs(folder_path, exist_ok=True)
                 created["folders"].append(folder)
                 self._log(f"📁 SCAFFOLD: Created {folder}/")
@@ -1847,7 +2814,7 @@ python main.py
         Returns list of installed packages.
         """
         import subprocess
-        import re
+        import importlib.util
         
         # Common external packages (not in stdlib)
         external_packages = {
@@ -1865,44 +2832,66 @@ python main.py
             'pytest': 'pytest',
         }
         
-        found_packages = set()
+        found_packages = {}  # pip name -> module name as imported
+        # One walk of the project, shared by the import scan and the smoke test
+        file_index = _project_file_index(project_path)
         
         for filename in saved_files:
             if not filename.endswith('.py'):
                 continue
             
             # Find the file
-            for root, dirs, files in os.walk(project_path):
-                if filename in files:
-                    filepath = os.path.join(root, filename)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        
-                        # Find imports
-                        import_pattern = r'^(?:from\s+(\w+)|import\s+(\w+))'
-                        for match in re.finditer(import_pattern, content, re.MULTILINE):
-                            module = match.group(1) or match.group(2)
-                            if module in external_packages:
-                                found_packages.add(external_packages[module])
-                    except:
-                        pass
-                    break
+            filepath = file_index.get(filename)
+            if filepath:
+                try:
+                    # Find imports: every top-level import in the whole file (a missed
+                    # install breaks the project at runtime, so no prologue shortcut here)
+                    for module in _top_level_imports(self._read_source(filepath), filepath):
+                        if module in external_packages:
+                            found_packages.setdefault(external_packages[module], module)
+                except Exception:
+                    pass
         
+        def pip_install(packages):
+            return subprocess.run(
+                ['pip', 'install', *packages, '--quiet'],
+                capture_output=True,
+                text=True,
+                timeout=60 * len(packages)
+            ).returncode == 0
+        
+        # Packages already importable here need no pip run (still listed as requirements)
         installed = []
-        for package in found_packages:
+        packages = []
+        for package, module in sorted(found_packages.items()):
             try:
-                result = subprocess.run(
-                    ['pip', 'install', package, '--quiet'],
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-                if result.returncode == 0:
-                    installed.append(package)
-                    self._log(f"📦 DEPS: Installed {package}")
+                present = importlib.util.find_spec(module) is not None
+            except Exception:
+                present = False
+            if present:
+                installed.append(package)
+            else:
+                packages.append(package)
+        
+        # One pip run for everything; pip installs all or nothing, so on
+        # failure retry per package to keep the ones that do install
+        batch_ok = False
+        if len(packages) > 1:
+            try:
+                batch_ok = pip_install(packages)
             except Exception as e:
-                self._log(f"📦 DEPS: Failed to install {package}: {e}")
+                self._log(f"📦 DEPS: Batch install failed: {e}")
+        if batch_ok:
+            installed += packages
+            self._log(f"📦 DEPS: Installed {', '.join(packages)}")
+        else:
+            for package in packages:
+                try:
+                    if pip_install([package]):
+                        installed.append(package)
+                        self._log(f"📦 DEPS: Installed {package}")
+                except Exception as e:
+                    self._log(f"📦 DEPS: Failed to install {package}: {e}")
         
         # Generate requirements.txt
         if installed:
@@ -1912,31 +2901,34 @@ python main.py
             self._log(f"📦 DEPS: Generated requirements.txt with {len(installed)} packages")
         
         # === SMOKE TEST: Verify imports actually work ===
+        # One interpreter compiles every file; results come back in file order
+        # Files that already compiled cleanly and haven't changed are skipped
+        smoke_jobs = [(filename, file_index[filename]) for filename in saved_files
+                      if filename.endswith('.py') and filename in file_index
+                      and not self._compiled_unchanged(file_index[filename])]
         smoke_failures = []
-        for filename in saved_files:
-            if not filename.endswith('.py'):
-                continue
-            
-            # Find the file
-            for root, dirs, files in os.walk(project_path):
-                if filename in files:
-                    filepath = os.path.join(root, filename)
-                    try:
-                        # Try to compile and check imports
-                        result = subprocess.run(
-                            ['python', '-m', 'py_compile', filepath],
-                            capture_output=True,
-                            text=True,
-                            timeout=10
-                        )
-                        if result.returncode != 0:
-                            smoke_failures.append((filename, result.stderr[:200]))
-                            self._log(f"🔴 SMOKE: Syntax error in {filename}")
-                        else:
-                            self._log(f"🟢 SMOKE: {filename} syntax OK")
-                    except Exception as e:
-                        smoke_failures.append((filename, str(e)))
-                    break
+        if smoke_jobs:
+            stat_keys = [self._stat_key(filepath) for _, filepath in smoke_jobs]
+            try:
+                result = subprocess.run(
+                    ['python', '-c', _SMOKE_DRIVER],
+                    input=json.dumps([filepath for _, filepath in smoke_jobs]),
+                    capture_output=True,
+                    text=True,
+                    timeout=10 + 2 * len(smoke_jobs)
+                )
+                if result.returncode != 0:
+                    raise RuntimeError(result.stderr[:200])
+                for (filename, filepath), key, line in zip(smoke_jobs, stat_keys, result.stdout.splitlines()):
+                    error = json.loads(line)["error"]
+                    if error:
+                        smoke_failures.append((filename, error[:200]))
+                        self._log(f"🔴 SMOKE: Syntax error in {filename}")
+                    else:
+                        self._compiled_ok[filepath] = key
+                        self._log(f"🟢 SMOKE: {filename} syntax OK")
+            except Exception as e:
+                smoke_failures.extend((filename, str(e)) for filename, _ in smoke_jobs)
         
         # Report smoke test results
         if smoke_failures:
@@ -1966,8 +2958,6 @@ python main.py
                 return False
             
             # Find the main class or function to call
-            import re
-            
             # Look for Simulation class or main function
             main_call = ""
             if 'class Simulation' in content:
@@ -2032,14 +3022,8 @@ if __name__ == "__main__":
             
             # Try to extract JSON from stdout
             if result.stdout:
-                try:
-                    # Look for JSON in output (between { and })
-                    import re
-                    json_match = re.search(r'\{[^{}]*\}', result.stdout, re.DOTALL)
-                    if json_match:
-                        output["json_data"] = json.loads(json_match.group())
-                except:
-                    pass
+                # Look for JSON in output (first decodable {...}, nesting allowed)
+                output["json_data"] = _first_json_object(result.stdout)
             
             # Also check for results file
             results_file = os.path.join(project_path, "simulation_results.json")
@@ -2170,24 +3154,26 @@ CRITICAL LENGTH REQUIREMENT:
                 content = f.read()
             
             doc = Document()
+            # Resolve styles once; passing names makes python-docx look each one up per paragraph
+            title_style, h1_style, h2_style, bullet_style = (
+                doc.styles[name] for name in ('Title', 'Heading 1', 'Heading 2', 'List Bullet')
+            )
             
             # Process markdown line by line
-            lines = content.split('\n')
-            for line in lines:
-                line = line.strip()
+            for line in map(str.strip, content.split('\n')):
                 if not line:
                     continue
                 
                 if line.startswith('# '):
                     # Title
-                    p = doc.add_heading(line[2:], level=0)
+                    p = doc.add_paragraph(line[2:], style=title_style)
                     p.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 elif line.startswith('## '):
-                    doc.add_heading(line[3:], level=1)
+                    doc.add_paragraph(line[3:], style=h1_style)
                 elif line.startswith('### '):
-                    doc.add_heading(line[4:], level=2)
+                    doc.add_paragraph(line[4:], style=h2_style)
                 elif line.startswith('- '):
-                    doc.add_paragraph(line[2:], style='List Bullet')
+                    doc.add_paragraph(line[2:], style=bullet_style)
                 else:
                     doc.add_paragraph(line)
             
@@ -2243,6 +3229,12 @@ CRITICAL LENGTH REQUIREMENT:
             else:
                 server_type = "python"
         
+        # Reuse this project's server if it is still running
+        running = self._dev_servers.get((project_path, server_type))
+        if running and running[0].poll() is None:
+            self._log(f"🚀 DEV: Reusing server at {running[1]['url']} (PID: {running[1]['pid']})")
+            return dict(running[1])
+        
         port = self._find_available_port()
         
         try:
@@ -2250,15 +3242,14 @@ CRITICAL LENGTH REQUIREMENT:
                 # Check if node_modules exists
                 if not os.path.exists(os.path.join(project_path, "node_modules")):
                     self._log("🔧 DEV: Running npm install...")
-                    subprocess.run(['npm', 'install'], cwd=project_path, capture_output=True)
+                    subprocess.run(_npm_cmd('install'), cwd=project_path, capture_output=True, timeout=300)
                 
                 # Start dev server
                 process = subprocess.Popen(
-                    ['npm', 'run', 'dev', '--', '--port', str(port)],
+                    _npm_cmd('run', 'dev', '--', '--port', str(port)),
                     cwd=project_path,
                     stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    shell=True
+                    stderr=subprocess.PIPE
                 )
             else:
                 # Python HTTP server
@@ -2272,13 +3263,16 @@ CRITICAL LENGTH REQUIREMENT:
             url = f"http://localhost:{port}"
             self._log(f"🚀 DEV: Server started at {url} (PID: {process.pid})")
             
-            return {
+            info = {
                 "success": True,
                 "pid": process.pid,
                 "port": port,
                 "url": url,
                 "type": server_type
             }
+            self._dev_servers[(project_path, server_type)] = (process, info)
+            _DEV_SERVER_PROCS.append(process)
+            return dict(info)
             
         except Exception as e:
             self._log(f"🚀 DEV: Failed to start server - {e}")
@@ -2290,26 +3284,20 @@ CRITICAL LENGTH REQUIREMENT:
         """
         import subprocess
         
-        # Check if Netlify CLI is installed
-        try:
-            result = subprocess.run(['netlify', '--version'], capture_output=True, text=True)
-            if result.returncode != 0:
-                self._log("📦 Installing Netlify CLI...")
-                subprocess.run(['npm', 'install', '-g', 'netlify-cli'], capture_output=True)
-        except FileNotFoundError:
+        # Check if Netlify CLI is installed (PATH lookup, no subprocess)
+        if not _cli_path('netlify'):
             self._log("📦 Installing Netlify CLI...")
-            subprocess.run(['npm', 'install', '-g', 'netlify-cli'], capture_output=True)
+            subprocess.run(_npm_cmd('install', '-g', 'netlify-cli'), capture_output=True)
         
         # Determine build directory
-        build_dir = project_path
-        for candidate in ['dist', 'build', 'public', '.']:
-            candidate_path = os.path.join(project_path, candidate)
-            if os.path.exists(candidate_path) and os.path.isdir(candidate_path):
-                build_dir = candidate_path
-                break
+        subdirs = _dir_entries(project_path, dirs_only=True)
+        build_dir = next(
+            (os.path.join(project_path, c) for c in ('dist', 'build', 'public') if c in subdirs),
+            os.path.join(project_path, '.')
+        )
         
         try:
-            cmd = ['netlify', 'deploy', '--dir', build_dir]
+            cmd = [_cli_path('netlify') or 'netlify', 'deploy', '--dir', build_dir]
             if prod:
                 cmd.append('--prod')
             
@@ -2322,8 +3310,7 @@ CRITICAL LENGTH REQUIREMENT:
             )
             
             # Extract URL from output
-            import re
-            url_match = re.search(r'(https://[^\s]+\.netlify\.app)', result.stdout)
+            url_match = _NETLIFY_URL_RE.search(result.stdout)
             deploy_url = url_match.group(1) if url_match else None
             
             if deploy_url:
@@ -2343,18 +3330,13 @@ CRITICAL LENGTH REQUIREMENT:
         """
         import subprocess
         
-        # Check if Vercel CLI is installed
-        try:
-            result = subprocess.run(['vercel', '--version'], capture_output=True, text=True)
-            if result.returncode != 0:
-                self._log("📦 Installing Vercel CLI...")
-                subprocess.run(['npm', 'install', '-g', 'vercel'], capture_output=True)
-        except FileNotFoundError:
+        # Check if Vercel CLI is installed (PATH lookup, no subprocess)
+        if not _cli_path('vercel'):
             self._log("📦 Installing Vercel CLI...")
-            subprocess.run(['npm', 'install', '-g', 'vercel'], capture_output=True)
+            subprocess.run(_npm_cmd('install', '-g', 'vercel'), capture_output=True)
         
         try:
-            cmd = ['vercel', '--yes']  # --yes for non-interactive
+            cmd = [_cli_path('vercel') or 'vercel', '--yes']  # --yes for non-interactive
             if prod:
                 cmd.append('--prod')
             
@@ -2367,8 +3349,7 @@ CRITICAL LENGTH REQUIREMENT:
             )
             
             # Extract URL from output
-            import re
-            url_match = re.search(r'(https://[^\s]+\.vercel\.app)', result.stdout)
+            url_match = _VERCEL_URL_RE.search(result.stdout)
             deploy_url = url_match.group(1) if url_match else None
             
             if deploy_url:
@@ -2428,19 +3409,42 @@ CRITICAL LENGTH REQUIREMENT:
         # Detect task type
         task_type = self._detect_task_type(original_objective)
         
-        project_name = self._get_project_name(original_objective)
-        project_path = os.path.join(WORKSPACE_DIR, "projects", project_name)
+        project_name, project_path = self._project_location(original_objective)
 
         # V3.4: Scaffold project structure on first access
         if not os.path.exists(project_path):
             os.makedirs(project_path, exist_ok=True)
         self._scaffold_project(project_path, project_type=task_type)
+        # Prefetched context only counts if no step has written files since it was fetched
+        self._drop_stale_prefetches(project_path)
 
-        # Route to specialist
-        routing = self._route_to_specialist(step, task_type, project_path)
+        # Route to specialist (already running if it was started ahead in a batch)
+        batched = self._specialist_futures.pop((step, project_path), None)
+        if batched is not None:
+            routing = self._classify_route(step)
+        else:
+            routing = self._route_to_specialist(step, task_type, project_path)
+        
+        # Overlap context retrieval and independent specialist steps with this step's LLM call
+        upcoming = [s for s in recycler.pending_steps if s != step]
+        self._prefetch_step_contexts(
+            [s for s in upcoming if (s, project_path) not in self._specialist_futures],
+            task_type, project_path
+        )
+        self._start_specialist_batch(step, routing, upcoming, task_type, project_path)
         
         # Execute via specialist
-        if routing["use_specialist"]:
+        if batched is not None:
+            try:
+                # Saves made ahead are applied now, in plan order, on this thread
+                response = self._finish_batched_step(batched)
+            except Exception as e:
+                self._log(f"  ⚠️ Batched step failed ({e}), running it directly")
+                response = self._call_specialist(
+                    routing["agent"], step, project_path,
+                    self._get_step_context(step, task_type, project_path)
+                )
+        elif routing["use_specialist"]:
             response = self._call_specialist(
                 routing["agent"], 
                 step, 
@@ -2449,8 +3453,6 @@ CRITICAL LENGTH REQUIREMENT:
             )
         else:
             # Direct LLM execution with STRUCTURED prompt
-            task_type = self._detect_task_type(original_objective)
-            
             # === V4.1: GET LOCKED PROJECT TYPE RULES ===
             project_type_injection = self._detect_and_lock_project_type(original_objective)
             
@@ -2481,7 +3483,9 @@ RULES:
 
 OUTPUT:"""
             
-            response = self._call_llm(structured_prompt, max_tokens=8192)
+            # Files named in their fence are written as soon as the block closes
+            stream = _FenceStream(lambda block: self._save_streamed_block(block, project_name))
+            response = self._call_llm(structured_prompt, max_tokens=8192, on_chunk=stream.feed)
 
         # CRITICAL: Auto-Save Supervisor (Fix for 'Lost in RAM' bug)
         # Capture artifacts immediately after generation
@@ -2575,8 +3579,29 @@ For data: Real numbers, not fabricated percentages
             missing_deps = self._audit_dependencies(project_path, all_py_files)
             if missing_deps:
                 self._log(f"🔬 DEPENDENCY AUDIT: {len(missing_deps)} missing modules detected: {missing_deps}")
-                # Force the agent to write these modules NOW
+                dep_project = self._get_project_name(original_objective)
+                produced = set()
+                
+                # Several missing modules: ask for all of them in one call
+                if len(missing_deps) > 1:
+                    module_list = "\n".join(f"- {m}.py" for m in missing_deps)
+                    dep_prompt = f"""CRITICAL: Your code imports these modules but their files do not exist:
+{module_list}
+You MUST implement ALL of them NOW with all the functions your code expects.
+Project path: {project_path}
+
+Output each module as its own code block starting with ```python filename="<module>.py". No explanations, just the code."""
+                    self._log(f"  -> Forcing implementation of {len(missing_deps)} modules in one call")
+                    dep_response = self._call_llm(dep_prompt)
+                    new_saved = self._extract_and_save_code(dep_response, dep_project)
+                    produced = {os.path.basename(f) for f in new_saved}
+                    if new_saved:
+                        response += f"\\n\\n[SYSTEM: Auto-generated dependency: {', '.join(new_saved)}]"
+                
+                # Force the agent to write any module still missing NOW, one call each
                 for missing_module in missing_deps:
+                    if f"{missing_module}.py" in produced:
+                        continue
                     dep_prompt = f"""CRITICAL: Your code imports '{missing_module}' but this file does not exist.
 You MUST implement '{missing_module}.py' NOW with all the functions your code expects.
 Project path: {project_path}
@@ -2584,7 +3609,7 @@ Project path: {project_path}
 Output the full Python code block for '{missing_module}.py'. No explanations, just the code."""
                     self._log(f"  -> Forcing implementation of: {missing_module}.py")
                     dep_response = self._call_llm(dep_prompt)
-                    new_saved = self._extract_and_save_code(dep_response, self._get_project_name(original_objective))
+                    new_saved = self._extract_and_save_code(dep_response, dep_project)
                     if new_saved:
                         response += f"\\n\\n[SYSTEM: Auto-generated dependency: {', '.join(new_saved)}]"
 
@@ -2624,38 +3649,36 @@ Output the full Python code block for '{missing_module}.py'. No explanations, ju
         # === V3.3: MULTI-PERSPECTIVE CODE REVIEW ===
         # Review saved code from multiple angles (security, performance, correctness)
         if saved_files:
+            file_index = _project_file_index(project_path)
             for filename in saved_files:
                 if not filename.endswith('.py'):
                     continue
                 
                 # Find and read the file
-                for root, dirs, files in os.walk(project_path):
-                    if filename in files:
-                        filepath = os.path.join(root, filename)
-                        try:
-                            with open(filepath, 'r', encoding='utf-8') as f:
-                                code = f.read()
-                            
-                            issues = self._multi_perspective_review(code, filename)
-                            critical_issues = [i for i in issues if i.get('risk') in ['critical', 'major']]
-                            
-                            if critical_issues:
-                                self._log(f"🔍 REVIEW: {filename} has {len(critical_issues)} critical issues")
-                                # Force fix for security issues
-                                security_issues = [i for i in critical_issues if i.get('perspective') == 'security']
-                                if security_issues:
-                                    sec_prompt = f"SECURITY ALERT for {filename}:\n"
-                                    for issue in security_issues:
-                                        sec_prompt += f"- {issue['title']}\n"
-                                    sec_prompt += "\nRewrite the code to fix these security issues."
-                                    self._log(f"  -> Forcing security fix for {filename}")
-                                    sec_response = self._call_llm(sec_prompt)
-                                    self._extract_and_save_code(sec_response, project_name)
-                            else:
-                                self._log(f"🔍 REVIEW: {filename} passed all perspectives ✅")
-                        except Exception as e:
-                            self._log(f"[Review] Error reading {filename}: {e}")
-                        break
+                filepath = file_index.get(filename)
+                if filepath:
+                    try:
+                        code = self._read_source(filepath)
+                        
+                        issues = self._multi_perspective_review(code, filename)
+                        critical_issues = [i for i in issues if i.get('risk') in ['critical', 'major']]
+                        
+                        if critical_issues:
+                            self._log(f"🔍 REVIEW: {filename} has {len(critical_issues)} critical issues")
+                            # Force fix for security issues
+                            security_issues = [i for i in critical_issues if i.get('perspective') == 'security']
+                            if security_issues:
+                                sec_prompt = f"SECURITY ALERT for {filename}:\n"
+                                for issue in security_issues:
+                                    sec_prompt += f"- {issue['title']}\n"
+                                sec_prompt += "\nRewrite the code to fix these security issues."
+                                self._log(f"  -> Forcing security fix for {filename}")
+                                sec_response = self._call_llm(sec_prompt)
+                                self._extract_and_save_code(sec_response, project_name)
+                        else:
+                            self._log(f"🔍 REVIEW: {filename} passed all perspectives ✅")
+                    except Exception as e:
+                        self._log(f"[Review] Error reading {filename}: {e}")
 
         # === V3.5: DATA-FIRST PIPELINE ===
         # After code is saved, run it and capture output for paper generation
@@ -2723,7 +3746,7 @@ Write the FULL paper now with proper academic formatting.
             saved_files = self._extract_and_save_code(result, project_name)
             if saved_files:
                 self._log(f"  Created {len(saved_files)} files in {project_name}/")
-                code_indexer.index_project(project_path)
+                code_indexer.index_files(project_path, saved_files)
                 
                 # Auto-run project if we have multiple files (looks like a complete project)
                 if len(saved_files) >= 3 and any(f.endswith(('.jsx', '.tsx', '.html')) for f in saved_files):
@@ -2745,7 +3768,7 @@ Write the FULL paper now with proper academic formatting.
         
         # === SMART CONTEXT: Only relevant files, not everything ===
         code_context = ""
-        if os.path.exists(project_path) and task_type == "coding":
+        if self._path_exists(project_path) and task_type == "coding":
             code_context = code_indexer.get_relevant_context(project_path, step, max_tokens=2000)
         
         # Build context section
@@ -2881,8 +3904,6 @@ For file operations on Windows:
 - At the end, state what was accomplished for this step."""
         
         # === ADAPTIVE TOKEN LIMITS ===
-        from .config import TOKEN_LIMITS
-        
         # Choose token limit based on step and task type
         if "plan" in step.lower() or "analyze" in step.lower():
             token_limit = TOKEN_LIMITS["planning"]  # 4K - fast for planning
@@ -2910,8 +3931,8 @@ For file operations on Windows:
         
         if saved_files:
             self._log(f"  Created {len(saved_files)} files in {project_name}/")
-            # Re-index the project after adding files
-            code_indexer.index_project(project_path)
+            # Index just the files we added
+            code_indexer.index_files(project_path, saved_files)
         
         # === HANDLE FILE EDITS ===
         edits = self._extract_file_edits(result)
@@ -2941,14 +3962,12 @@ For file operations on Windows:
         commands = []
         
         # Look for [COMMAND]: pattern
-        cmd_pattern = r'\[COMMAND\]:\s*(.+?)(?:\n|$)'
-        matches = re.findall(cmd_pattern, result, re.IGNORECASE)
+        matches = _CMD_RE.findall(result)
         commands.extend(matches)
         
         # Also look for common command patterns in context
         # e.g., "Run `npm install`" or "Execute: npm run build"
-        run_pattern = r'(?:run|execute)[:\s]+`?([^`\n]+)`?'
-        matches = re.findall(run_pattern, result, re.IGNORECASE)
+        matches = _RUN_RE.findall(result)
         for m in matches:
             cmd = m.strip()
             if cmd and len(cmd) < 100:  # Sanity check
@@ -2964,8 +3983,7 @@ For file operations on Windows:
         # [EDIT] file.py: replace "old" with "new"
         # Edit src/index.html: change "old content" to "new content"
         
-        edit_pattern = r'\[EDIT\]\s*([^:]+):\s*(?:replace|change)\s*["\'](.+?)["\']\s*(?:with|to)\s*["\'](.+?)["\']'
-        matches = re.findall(edit_pattern, result, re.IGNORECASE | re.DOTALL)
+        matches = _EDIT_RE.findall(result)
         
         for file_path, old_content, new_content in matches:
             edits.append({
@@ -2977,11 +3995,42 @@ For file operations on Windows:
         return edits[:3]  # Limit to 3 edits per step
     
     
-    def _run_qa_feedback(self, project_path: str, max_attempts: int = 2) -> Optional[Dict]:
+    def _project_signature(self, project_path: str) -> int:
+        """Cheap fingerprint of the project tree (paths, sizes, mtimes) for change detection."""
+        entries = []
+        for root, dirs, files in os.walk(project_path):
+            dirs[:] = [d for d in dirs if d not in ['__pycache__', 'node_modules', '.git', '.jarvis']]
+            for f in files:
+                try:
+                    st = os.stat(os.path.join(root, f))
+                except OSError:
+                    continue
+                entries.append((os.path.relpath(os.path.join(root, f), project_path), st.st_size, st.st_mtime_ns))
+        return hash(tuple(sorted(entries)))
+    
+    def _run_qa_feedback(self, project_path: str, max_attempts: int = 2,
+                         signature: Optional[int] = None) -> Optional[Dict]:
         """
         Run QA on project and attempt auto-fix if issues found.
         This is the feedback loop that makes the AI self-correcting.
+        Skipped (cached result returned) when the project is unchanged since the last run.
+        Pass `signature` if the caller already fingerprinted the tree, to avoid a second walk.
         """
+        if signature is None:
+            signature = self._project_signature(project_path)
+        if signature == self._last_qa_signature and self._last_qa_result is not None:
+            self._log("  [QA] No changes since last QA run - skipping")
+            return self._last_qa_result
+        
+        qa_result = self._qa_feedback_loop(project_path, max_attempts)
+        
+        # Fingerprint AFTER fixes so the next call sees the fixed tree as baseline
+        self._last_qa_signature = self._project_signature(project_path)
+        self._last_qa_result = qa_result
+        return qa_result
+    
+    def _qa_feedback_loop(self, project_path: str, max_attempts: int) -> Optional[Dict]:
+        """Run QA and apply LLM fixes for up to max_attempts rounds."""
         for attempt in range(max_attempts):
             # Run QA check
             qa_result = qa_agent.run(project_path)
@@ -3021,12 +4070,10 @@ For file operations on Windows:
         Each step produces a COMPLETE, POLISHED module - not shallow fragments.
         """
         self._log("Planning steps...")
+        obj_lower = objective.lower()
         
         # Detect if this is a large/complex project
-        complex_keywords = ["os", "system", "platform", "ecosystem", "full", "complete", 
-                           "entire", "everything", "crm", "dashboard", "app", "application",
-                           "business", "enterprise", "management"]
-        is_complex = any(kw in objective.lower() for kw in complex_keywords)
+        is_complex = bool(_COMPLEX_PROJECT_RE.search(obj_lower))
         
         if is_complex:
             # V4.4: DEEP WORK planning - each step produces a COMPLETE file
@@ -3071,7 +4118,7 @@ Output ONLY numbered steps. Each must have "COMPLETE" and -> OUTPUT: [filename].
                 self._log(f"  [Planner] Long objective ({len(objective)} chars), may need retry")
         else:
             # Check if this is a research/algorithm task
-            is_research = any(kw in objective.lower() for kw in [
+            is_research = any(kw in obj_lower for kw in [
                 "research", "algorithm", "paper", "academic", "benchmark", "novel", "study"
             ])
             
@@ -3142,64 +4189,56 @@ Output 20-50 specific, granular steps with OUTPUT specified."""
         
         # Parse steps from response - AGGRESSIVE parsing to catch ALL steps
         steps = []
-        import re
         
-        # Split by newlines and process each line
-        for line in response.split("\n"):
-            line = line.strip()
+        # Walk the non-empty lines without building a list of them
+        for line_match in _LINE_RE.finditer(response):
+            line = line_match.group().strip()
             if not line or len(line) < 10:
                 continue
             
             # Skip pure headers/phase labels without actionable content
-            if re.match(r'^(PHASE|Phase)\s*\d*[:\s]*$', line):
+            if _PHASE_LABEL_RE.match(line):
                 continue
-            if line.startswith("---") or line.startswith("==="):
+            if line.startswith(("---", "===")):
                 continue
-            if re.match(r'^#+ (PHASE|Phase)', line):
+            if _PHASE_HEADING_RE.match(line):
                 continue
                 
             # AGGRESSIVE MATCHING - any line that looks like a step
             
             # Match numbered lists: "1.", "1)", "Step 1:", "1 -", etc.
-            if re.match(r'^[\d]+[\.\)\:\-\s]', line):
-                step = re.sub(r'^[\d]+[\.\)\:\-\s]+', '', line).strip()
-                step = re.sub(r'^\[.*?\]\s*', '', step).strip()  # Remove [COMPONENT] tags
-                step = re.sub(r'^Step\s*\d*[:\.]?\s*', '', step).strip()  # Remove "Step N:" prefix
+            if _NUMBER_PREFIX_RE.match(line):
+                # Strip "1." then [COMPONENT] tags then "Step N:" prefix
+                step = _NUMBERED_STEP_CLEAN_RE.sub('', line).strip()
                 if step and len(step) > 10:
                     steps.append(step)
                 continue
             
             # Match bulleted lists: "- item", "* item", "• item"
-            if line.startswith("-") or line.startswith("*") or line.startswith("•"):
-                step = re.sub(r'^[\-\*•\s]+', '', line).strip()
-                step = re.sub(r'^\[.*?\]\s*', '', step).strip()
+            if line.startswith(("-", "*", "•")):
+                step = _BULLET_STEP_CLEAN_RE.sub('', line).strip()
                 if step and len(step) > 10:
                     steps.append(step)
                 continue
             
             # Match markdown headers with content: "## Create landing page"
             if line.startswith("#"):
-                step = re.sub(r'^#+\s*', '', line).strip()
-                step = re.sub(r'^[\d]+[\.\)\:\-\s]+', '', step).strip()
-                step = re.sub(r'^Step\s*\d*[:\.]?\s*', '', step).strip()
-                step = re.sub(r'^\[.*?\]\s*', '', step).strip()
+                step = _HEADING_STEP_CLEAN_RE.sub('', line).strip()
                 if step and len(step) > 10 and not any(skip in step.lower() for skip in ['phase', 'section', 'part']):
                     steps.append(step)
                 continue
             
             # Match bold markers: "**Create landing page**"
             if line.startswith("**"):
-                step = re.sub(r'^\*+\s*', '', line).strip()
-                step = re.sub(r'\*+$', '', step).strip()
-                step = re.sub(r'^Step\s*\d*[:\.]?\s*', '', step).strip()
-                step = re.sub(r'^\[.*?\]\s*', '', step).strip()
+                step = _BOLD_STEP_CLEAN_RE.sub('', line)
+                step = _BOLD_SUFFIX_RE.sub('', step).strip()
                 if step and len(step) > 10:
                     steps.append(step)
                 continue
             
             # Match lines starting with [COMPONENT], [ACTION], etc.
             if line.startswith("["):
-                step = re.sub(r'^\[.*?\]\s*', '', line).strip()
+                step = _TAG_PREFIX_RE.sub('', line).strip()
                 if step and len(step) > 10:
                     steps.append(step)
                 continue
@@ -3207,16 +4246,18 @@ Output 20-50 specific, granular steps with OUTPUT specified."""
         # If still not enough steps, try sentence-based extraction
         if len(steps) < 40:
             self._log(f"  [Planner] Only {len(steps)} steps found, trying deeper extraction...")
-            sentences = re.split(r'[.!?]\s+', response)
-            action_words = ['create', 'build', 'implement', 'add', 'design', 'develop', 'setup', 
-                           'configure', 'write', 'generate', 'define', 'test', 'integrate', 
-                           'deploy', 'optimize', 'research', 'analyze', 'document']
+            sentences = _SENTENCE_SPLIT_RE.split(response)
+            steps_lower = [existing.lower() for existing in steps]  # Lowered once, kept in step
             for sent in sentences:
                 sent = sent.strip()
-                if len(sent) > 20 and any(word in sent.lower() for word in action_words):
+                if len(sent) <= 20:
+                    continue
+                sent_lower = sent.lower()
+                if _ACTION_WORD_RE.search(sent_lower):
                     # Don't duplicate
-                    if not any(existing.lower() in sent.lower() or sent.lower() in existing.lower() for existing in steps):
+                    if not any(existing in sent_lower or sent_lower in existing for existing in steps_lower):
                         steps.append(sent[:200])
+                        steps_lower.append(sent[:200].lower())
         
         # CRITICAL: If we still have < 40 steps, RETRY with stronger prompt
         if len(steps) < 40:
@@ -3243,14 +4284,12 @@ OUTPUT ONLY NUMBERED STEPS (1. 2. 3. etc.). NO EXPLANATIONS. MINIMUM 50 STEPS.""
             
             # Parse the retry response
             retry_steps = []
-            for line in response.split("\n"):
-                line = line.strip()
+            for line_match in _LINE_RE.finditer(response):
+                line = line_match.group().strip()
                 if not line or len(line) < 10:
                     continue
-                if re.match(r'^[\d]+[\.\)\:\-\s]', line):
-                    step = re.sub(r'^[\d]+[\.\)\:\-\s]+', '', line).strip()
-                    step = re.sub(r'^\[.*?\]\s*', '', step).strip()
-                    step = re.sub(r'^Step\s*\d*[:\.]?\s*', '', step).strip()
+                if _NUMBER_PREFIX_RE.match(line):
+                    step = _NUMBERED_STEP_CLEAN_RE.sub('', line).strip()
                     if step and len(step) > 10:
                         retry_steps.append(step)
             
@@ -3278,14 +4317,22 @@ OUTPUT ONLY NUMBERED STEPS (1. 2. 3. etc.). NO EXPLANATIONS. MINIMUM 50 STEPS.""
             Final result with logs and artifacts
         """
         self.progress_callback = progress_callback
+        self._cmd_queue = queue.SimpleQueue()  # Drop commands left over from a previous run
+        self._cancel.clear()
         self.is_running = True
+        self._executor_thread_id = threading.get_ident()
         self.iteration = 0
-        self.log = []
+        self.log = deque(maxlen=LOG_MEMORY_LIMIT)
+        self._last_qa_signature = None
+        self._last_qa_result = None
+        self._prefetch_step_contexts([], "", "")  # Cancel leftovers from a previous run
+        self._prefetch_signature = None
+        self._discard_all_specialists()
+        self._existing_paths = set()
         
         # === RESUME FROM CHECKPOINT ===
         if resume_checkpoint:
             try:
-                from .utils.checkpoint import checkpoint_manager
                 cp = checkpoint_manager.get_checkpoint_by_id(resume_checkpoint)
                 if cp:
                     self._log(f"=== RESUMING FROM CHECKPOINT {resume_checkpoint} ===")
@@ -3297,7 +4344,7 @@ OUTPUT ONLY NUMBERED STEPS (1. 2. 3. etc.). NO EXPLANATIONS. MINIMUM 50 STEPS.""
                     self.iteration = cp["iteration"]
                     recycler.task_objective = cp["objective"]
                     recycler.completed_steps = cp["completed_steps"]
-                    recycler._pending_steps = cp["pending_steps"]
+                    recycler.pending_steps = list(cp["pending_steps"])
                     
                     # Skip to Phase 3 (execution loop)
                     project_path = cp.get("project_path", "")
@@ -3345,6 +4392,7 @@ OUTPUT ONLY NUMBERED STEPS (1. 2. 3. etc.). NO EXPLANATIONS. MINIMUM 50 STEPS.""
                     self._log("Skipping refinement (prompt already detailed)")
                 else:
                     try:
+                        from .prompt_refiner import prompt_refiner
                         refined = prompt_refiner.quick_refine(objective)
                         if refined and refined != objective:
                             self._log(f"Refined to: {refined[:200]}...")
@@ -3401,7 +4449,6 @@ Steps:"""
                             improved_result = self._call_llm(improved_plan_prompt, max_tokens=2000, temperature=0.2)
                             
                             # Extract improved steps
-                            import re
                             improved_steps = re.findall(r'^\d+[\.\)]\s*(.+?)(?=\n\d+[\.\)]|\n*$)', improved_result, re.MULTILINE)
                             if improved_steps and len(improved_steps) >= 3:
                                 steps = improved_steps
@@ -3416,8 +4463,8 @@ Steps:"""
             
             # Phase 2.5: Create project BEFORE execution starts
             # This ensures all agents have a valid project_path to save files
-            project_name = self._get_project_name(objective)
-            project_path = os.path.join(WORKSPACE_DIR, "projects", project_name)
+            # (objective is final from here on, so this is reused for the whole run)
+            project_name, project_path = self._project_location(objective)
             
             if not os.path.exists(project_path):
                 self._log(f"Creating project: {project_name}")
@@ -3432,6 +4479,11 @@ Steps:"""
             self._log("Phase 3: Execution")
             
             while self.is_running and self.iteration < self.max_iterations:
+                # Apply pause/resume/plan commands (blocks here while paused)
+                self._check_pause()
+                if not self.is_running:
+                    break
+                
                 self.iteration += 1
                 self._log(f"--- Iteration {self.iteration} ---")
                 
@@ -3445,7 +4497,7 @@ Steps:"""
                     self._log("Recycled and continuing...")
                 
                 # Get progress
-                progress = recycler.get_progress()
+                progress = self._get_progress()
                 
                 # Check if done
                 if not progress["pending_steps"]:
@@ -3499,10 +4551,7 @@ Steps:"""
                 # === V4.0: CODING ITERATION LIMIT ===
                 # Track coding steps to prevent infinite loops
                 step_lower = next_step.lower()
-                is_coding_step = any(kw in step_lower for kw in [
-                    'implement', 'create', 'build', 'code', 'component', 'api', 
-                    'backend', 'frontend', 'database', 'auth', 'module'
-                ])
+                is_coding_step = bool(_CODING_STEP_RE.search(step_lower))
                 
                 if is_coding_step:
                     self.coding_iterations += 1
@@ -3521,27 +4570,19 @@ Steps:"""
                 # === AUTO-CHECKPOINT (Crash Recovery) ===
                 # Save state every 5 steps for server restart recovery
                 if self.iteration % 5 == 0:
-                    try:
-                        from .utils.checkpoint import checkpoint_manager
-                        checkpoint_manager.save_checkpoint(
-                            objective=recycler.task_objective,
-                            iteration=self.iteration,
-                            completed_steps=recycler.completed_steps,
-                            pending_steps=progress["pending_steps"][1:],  # Remaining steps
-                            project_path=project_path,
-                            metadata={"log_count": len(self.log)}
-                        )
-                        self._log(f"💾 Checkpoint saved at iteration {self.iteration}")
-                    except Exception as e:
-                        self._log(f"⚠️ Checkpoint failed: {e}")
+                    self._queue_checkpoint(
+                        pending_steps=progress["pending_steps"][1:],  # Remaining steps
+                        project_path=project_path
+                    )
                 
                 # === QA FEEDBACK LOOP ===
                 # After code is generated, verify and fix if needed
-                project_name = self._get_project_name(recycler.task_objective)
-                project_path = os.path.join(WORKSPACE_DIR, "projects", project_name)
-                
-                if os.path.exists(project_path):
-                    self._run_qa_feedback(project_path)
+                # (skipped for research/writing steps that saved no files)
+                # Fingerprint the tree so writes by any agent (coder, doc savers, git, [EDIT]) count
+                if self._path_exists(project_path):
+                    signature = self._project_signature(project_path)
+                    if signature != self._last_qa_signature:
+                        self._run_qa_feedback(project_path, signature=signature)
                 
                 # Check for completion signal in result
                 if self._check_completion(result):
@@ -3552,10 +4593,7 @@ Steps:"""
                 recycler.current_tokens = recycler.get_total_context_tokens()
             
             # === FINAL QA CHECK ===
-            project_name = self._get_project_name(objective)
-            project_path = os.path.join(WORKSPACE_DIR, "projects", project_name)
-            
-            if os.path.exists(project_path):
+            if self._path_exists(project_path):
                 self._log("Phase 4: Final QA")
                 final_qa = self._run_qa_feedback(project_path, max_attempts=3)
                 qa_status = final_qa.get("overall_status", "unknown") if final_qa else "skipped"
@@ -3564,22 +4602,27 @@ Steps:"""
                 # === PHASE 5: VISUAL QA ===
                 # Take headless screenshots and analyze with vision model
                 task_type = self._detect_task_type(objective)
-                if task_type == "coding" and ("web" in objective.lower() or "page" in objective.lower() or "site" in objective.lower() or "frontend" in objective.lower()):
+                objective_lower = objective.lower()
+                if task_type == "coding" and any(kw in objective_lower for kw in ("web", "page", "site", "frontend")):
                     self._log("Phase 5: Visual QA (Headless)")
                     try:
+                        from .visual_qa import visual_qa
                         visual_result = visual_qa.analyze_project(project_path)
                         visual_score = visual_result.get("average_score", 0)
-                        visual_issues = visual_result.get("total_issues", 0)
-                        critical_issues = len(visual_result.get("critical_issues", []))
+                        critical_issues = visual_result.get("critical_issues")
                         
-                        if visual_score >= 70 and critical_issues == 0:
+                        if visual_score >= 70 and not critical_issues:
                             self._log(f"Visual QA: PASSED (score: {visual_score}/100)")
                         else:
-                            self._log(f"Visual QA: {visual_issues} issues found ({critical_issues} critical)")
-                            # Log recommendations
-                            for page in visual_result.get("pages_analyzed", []):
-                                for rec in page.get("analysis", {}).get("recommendations", [])[:2]:
-                                    self._log(f"  → {rec}")
+                            # Issue details are only needed when reporting a failure
+                            visual_issues = visual_result.get("total_issues", 0)
+                            self._log(f"Visual QA: {visual_issues} issues found ({len(critical_issues or ())} critical)")
+                            # Log recommendations (top 2 per page) as one entry
+                            recs = [f"  → {rec}"
+                                    for page in visual_result.get("pages_analyzed") or ()
+                                    for rec in (page.get("analysis") or {}).get("recommendations", ())[:2]]
+                            if recs:
+                                self._log("\n".join(recs))
                     except Exception as e:
                         self._log(f"Visual QA skipped: {e}")
                 
@@ -3629,7 +4672,7 @@ Steps:"""
                             "objective": objective[:500],
                             "task_type": task_type,
                             "steps_completed": len(recycler.completed_steps),
-                            "files_created": os.listdir(project_path) if os.path.exists(project_path) else [],
+                            "files_created": os.listdir(project_path) if self._path_exists(project_path) else [],
                             "timestamp": datetime.now().isoformat()
                         }
                     )
@@ -3697,19 +4740,19 @@ Steps:"""
             
             # Final summary
             self._log("=== AUTONOMOUS MODE COMPLETE ===")
-            final_progress = recycler.get_progress()
+            final_progress = self._get_progress()
             
             return {
                 "status": "complete",
                 "objective": objective,
                 "iterations": self.iteration,
                 "progress": final_progress,
-                "project_path": project_path if os.path.exists(project_path) else None,
+                "project_path": project_path if self._path_exists(project_path) else None,
                 "github_url": github_url,
                 "deployment": deployment_info,
-                "log": self.log,
+                "log": list(self.log),
                 "domain_files": {
-                    domain: recycler.read_domain(domain)[-500:]
+                    domain: recycler.read_domain(domain, max_chars=500)
                     for domain in recycler.DOMAINS
                 }
             }
@@ -3719,16 +4762,21 @@ Steps:"""
             return {
                 "status": "error",
                 "error": str(e),
-                "log": self.log
+                "log": list(self.log)
             }
         
         finally:
+            self._ckpt_queue.join()  # Flush queued checkpoints before returning
+            _flush_history_log()
+            _flush_console()
             self.is_running = False
     
     def stop(self):
         """Stop the autonomous loop."""
         self._log("Stop requested")
+        self._cancel.set()
         self.is_running = False
+        self._cmd_queue.put(("stop",))  # Wake the loop if it is paused
 
 
 # Singleton
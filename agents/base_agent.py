@@ -6,6 +6,7 @@ import requests
 import json
 import re
 from abc import ABC, abstractmethod
+from typing import Callable, Optional
 from .config import LM_STUDIO_URL, AGENT_TEMPS, MAX_OUTPUT_TOKENS
 from .context_manager import context
 
@@ -42,8 +43,12 @@ class BaseAgent(ABC):
         """Alias for call_llm for child agent compatibility."""
         return self.call_llm(prompt, max_tokens=max_tokens)
     
-    def call_llm(self, user_input: str, include_context: bool = True, json_mode: bool = False, max_tokens: int = None) -> str:
-        """Make a call to the local LLM server with smart timeout handling."""
+    def call_llm(self, user_input: str, include_context: bool = True, json_mode: bool = False, max_tokens: int = None,
+                 on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Make a call to the local LLM server with smart timeout handling.
+        on_chunk, if given, receives each streamed piece of content as it arrives.
+        """
         messages = self._build_messages(user_input, include_context)
         
         # Use provided max_tokens or fall back to default
@@ -91,6 +96,8 @@ class BaseAgent(ABC):
                             if content:
                                 full_content += content
                                 token_count += 1
+                                if on_chunk:
+                                    on_chunk(content)
                                 # Progress indicator every 100 tokens
                                 if token_count - last_print >= 100:
                                     elapsed = int(time.time() - start_time)
@@ -28,6 +28,8 @@ class CodeIndexer:
     
     def __init__(self):
         self.indexes: Dict[str, Dict] = {}  # project_path -> index
+        # project_path -> {rel_path: ((mtime_ns, size), file_info)}; unchanged files skip re-parsing
+        self._file_stats: Dict[str, Dict[str, Tuple]] = {}
     
     def index_project(self, project_path: str) -> Dict:
         """
@@ -46,6 +48,8 @@ class CodeIndexer:
             "total_lines": 0,
             "total_size": 0
         }
+        previous = self._file_stats.get(project_path, {})
+        stats = {}
         
         for root, dirs, files in os.walk(project_path):
             # Skip hidden directories and node_modules
@@ -56,24 +60,84 @@ class CodeIndexer:
                     full_path = os.path.join(root, file)
                     rel_path = os.path.relpath(full_path, project_path)
                     
-                    file_info = self._index_file(full_path, rel_path)
-                    index["files"].append(file_info)
+                    # Reuse the previous entry if the file hasn't changed since
+                    signature = self._stat_signature(full_path)
+                    cached = previous.get(rel_path)
+                    if signature is not None and cached is not None and cached[0] == signature:
+                        file_info = cached[1]
+                    else:
+                        file_info = self._index_file(full_path, rel_path)
+                    stats[rel_path] = (signature, file_info)
                     
-                    # Index by type
-                    file_type = file_info["type"]
-                    if file_type not in index["by_type"]:
-                        index["by_type"][file_type] = []
-                    index["by_type"][file_type].append(rel_path)
-                    
-                    # Index by name
-                    index["by_name"][file] = rel_path
-                    
-                    index["total_lines"] += file_info["lines"]
-                    index["total_size"] += file_info["size"]
+                    self._add_to_index(index, file, rel_path, file_info)
         
         self.indexes[project_path] = index
+        self._file_stats[project_path] = stats
         return index
     
+    def index_files(self, project_path: str, file_paths: List[str]) -> Dict:
+        """
+        Add or refresh just the given files in a project's index.
+        Falls back to a full index_project() if the project isn't indexed yet.
+        """
+        index = self.indexes.get(project_path)
+        if index is None:
+            return self.index_project(project_path)
+        
+        stats = self._file_stats.setdefault(project_path, {})
+        positions = {info["path"]: i for i, info in enumerate(index["files"])}
+        
+        for file_path in file_paths:
+            full_path = os.path.join(project_path, file_path) if not file_path.startswith(project_path) else file_path
+            rel_path = os.path.relpath(full_path, project_path)
+            file = os.path.basename(rel_path)
+            
+            # Same filters as the full walk
+            parent_dirs = rel_path.split(os.sep)[:-1]
+            if (not self._is_code_file(file) or not os.path.isfile(full_path)
+                    or any(d.startswith('.') or d == 'node_modules' for d in parent_dirs)):
+                continue
+            
+            file_info = self._index_file(full_path, rel_path)
+            stats[rel_path] = (self._stat_signature(full_path), file_info)
+            
+            if rel_path in positions:
+                # Refresh in place, keeping totals consistent
+                old_info = index["files"][positions[rel_path]]
+                index["files"][positions[rel_path]] = file_info
+                index["total_lines"] += file_info["lines"] - old_info["lines"]
+                index["total_size"] += file_info["size"] - old_info["size"]
+            else:
+                positions[rel_path] = len(index["files"])
+                self._add_to_index(index, file, rel_path, file_info)
+        
+        index["indexed_at"] = datetime.now().isoformat()
+        return index
+    
+    def _add_to_index(self, index: Dict, file: str, rel_path: str, file_info: Dict):
+        """Append one file's entry and update the lookup tables and totals."""
+        index["files"].append(file_info)
+        
+        # Index by type
+        file_type = file_info["type"]
+        if file_type not in index["by_type"]:
+            index["by_type"][file_type] = []
+        index["by_type"][file_type].append(rel_path)
+        
+        # Index by name
+        index["by_name"][file] = rel_path
+        
+        index["total_lines"] += file_info["lines"]
+        index["total_size"] += file_info["size"]
+    
+    def _stat_signature(self, full_path: str) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) used to tell whether a file changed since it was indexed."""
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
     def _index_file(self, full_path: str, rel_path: str) -> Dict:
         """Index a single file with metadata."""
         try:
@@ -12,7 +12,8 @@ Flow:
 import os
 import json
 import requests
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from .config import CONTEXT_DIR, LM_STUDIO_URL, WORKSPACE_DIR
 from .code_indexer import code_indexer
 
@@ -94,41 +95,8 @@ class ContextRetriever:
         Ask the LLM which context files are relevant for this task.
         This is the RAG query step.
         """
-        # Build file list for LLM
-        file_list = "\n".join([f"- {k}: {v}" for k, v in self.CONTEXT_FILES.items()])
-        
-        prompt = f"""You are a context selector. Given a task, select which context files are relevant.
-
-TASK: {task}
-AGENT: {agent_name or "general"}
-
-AVAILABLE CONTEXT FILES:
-{file_list}
-
-Select 1-3 files that are most relevant. Return ONLY a JSON array, nothing else:
-["file1.md", "file2.md"]
-
-If no files are clearly relevant, return: ["task_state.md"]
-"""
-        
         try:
-            response = requests.post(
-                LM_STUDIO_URL,
-                json={
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 100,
-                    "temperature": 0
-                },
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                reply = response.json()["choices"][0]["message"]["content"].strip()
-                # Parse JSON array
-                if reply.startswith("["):
-                    files = json.loads(reply)
-                    # Validate files exist in our list
-                    return [f for f in files if f in self.CONTEXT_FILES]
+            return list(_llm_file_selection(task, agent_name))
         except:
             pass
         
@@ -224,6 +192,51 @@ If no files are clearly relevant, return: ["task_state.md"]
         }
 
 
+@lru_cache(maxsize=256)
+def _llm_file_selection(task: str, agent_name: Optional[str]) -> Tuple[str, ...]:
+    """
+    LLM pick of context files for a task. Memoized: the query runs at
+    temperature 0 and only names files (contents are always re-read), so
+    repeated steps reuse the answer. Raises on failure, so only real answers are cached.
+    """
+    # Build file list for LLM
+    file_list = "\n".join([f"- {k}: {v}" for k, v in ContextRetriever.CONTEXT_FILES.items()])
+    
+    prompt = f"""You are a context selector. Given a task, select which context files are relevant.
+
+TASK: {task}
+AGENT: {agent_name or "general"}
+
+AVAILABLE CONTEXT FILES:
+{file_list}
+
+Select 1-3 files that are most relevant. Return ONLY a JSON array, nothing else:
+["file1.md", "file2.md"]
+
+If no files are clearly relevant, return: ["task_state.md"]
+"""
+    
+    response = requests.post(
+        LM_STUDIO_URL,
+        json={
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 100,
+            "temperature": 0
+        },
+        timeout=10
+    )
+    if response.status_code != 200:
+        raise ValueError(f"Context selector HTTP {response.status_code}")
+    
+    reply = response.json()["choices"][0]["message"]["content"].strip()
+    # Parse JSON array
+    if not reply.startswith("["):
+        raise ValueError("Context selector did not return a JSON array")
+    files = json.loads(reply)
+    # Validate files exist in our list
+    return tuple(f for f in files if f in ContextRetriever.CONTEXT_FILES)
+
+
 # Singleton
 context_retriever = ContextRetriever()
 
@@ -28,6 +28,7 @@ class ContextRecycler:
         self.task_objective = ""
         self.completed_steps = []
         self.pending_steps = []
+        self._version = 0  # Bumped whenever task/step state changes
         
         # Get domains from registry (single source of truth)
         try:
@@ -280,13 +281,25 @@ class ContextRecycler:
         
         filepath = os.path.join(CONTEXT_DIR, self.DOMAINS[domain])
         if os.path.exists(filepath):
+            if max_chars:
+                return self._read_tail(filepath, max_chars)
             with open(filepath, "r", encoding="utf-8") as f:
-                content = f.read()
-                if max_chars and len(content) > max_chars:
-                    return content[-max_chars:]
-                return content
+                return f.read()
         return ""
     
+    def _read_tail(self, filepath: str, max_chars: int) -> str:
+        """Last max_chars characters of a file, reading only the bytes that can hold them."""
+        # UTF-8 is at most 4 bytes per char; +3 covers a split char at the seek point
+        max_bytes = max_chars * 4 + 3
+        with open(filepath, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - max_bytes))
+            data = f.read()
+        # Match text-mode reads: universal newlines
+        content = data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+        return content[-max_chars:]
+    
     def clear_domain(self, domain: str):
         """Clear a domain context file."""
         if domain in self.DOMAINS:
@@ -375,6 +388,7 @@ class ContextRecycler:
         self.task_objective = objective
         self.pending_steps = steps or []
         self.completed_steps = []
+        self._version += 1
         
         # Generate unique task ID
         task_id = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -407,6 +421,7 @@ class ContextRecycler:
         if step in self.pending_steps:
             self.pending_steps.remove(step)
         self.completed_steps.append({"step": step, "result": result})
+        self._version += 1
         
         # Update task_state
         self.save_to_domain("task_state", f"Completed: {step}\nResult: {result[:200]}")
@@ -7,6 +7,7 @@ import os
 import base64
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional
 from .config import WORKSPACE_DIR
@@ -29,6 +30,9 @@ class VisualQA:
     - Mobile responsiveness issues
     """
     
+    # Screenshot analyses are independent vision-model calls (I/O bound)
+    MAX_WORKERS = 4
+    
     def __init__(self):
         self.results_dir = os.path.join(WORKSPACE_DIR, ".context", "visual_qa")
         os.makedirs(self.results_dir, exist_ok=True)
@@ -260,55 +264,51 @@ If no issues are found, return an empty issues array and score of 100.
         
         scores = []
         
-        # Analyze each screenshot
+        # Collect every screenshot first, then analyze them concurrently
+        jobs = []
         for file_result in browser_results.get("files_tested", []):
+            page = file_result.get("file")
             screenshot = file_result.get("screenshot")
             if screenshot and os.path.exists(screenshot):
-                print(f"[Visual QA] Analyzing: {os.path.basename(screenshot)}")
-                
-                analysis = self.analyze_screenshot(
-                    screenshot, 
-                    f"Page: {file_result.get('file', 'unknown')}"
-                )
-                
-                results["pages_analyzed"].append({
-                    "page": file_result.get("file"),
-                    "screenshot": screenshot,
-                    "analysis": analysis
-                })
+                jobs.append((page, screenshot, f"Page: {page or 'unknown'}", False))
+            
+            # Also check mobile screenshot
+            for viewport_test in file_result.get("viewport_tests", []):
+                mobile_screenshot = viewport_test.get("screenshot")
+                if mobile_screenshot and os.path.exists(mobile_screenshot):
+                    jobs.append((page, mobile_screenshot, f"Mobile view of: {page or 'unknown'}", True))
+        
+        def analyze(job):
+            page, screenshot, page_context, is_mobile = job
+            label = "mobile: " if is_mobile else ""
+            print(f"[Visual QA] Analyzing {label}{os.path.basename(screenshot)}")
+            return self.analyze_screenshot(screenshot, page_context)
+        
+        analyses = []
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(jobs))) as executor:
+                analyses = list(executor.map(analyze, jobs))
+        
+        # Aggregate in original page order
+        for (page, screenshot, _, is_mobile), analysis in zip(jobs, analyses):
+            results["pages_analyzed"].append({
+                "page": f"{page} (mobile)" if is_mobile else page,
+                "screenshot": screenshot,
+                "analysis": analysis
+            })
+            
+            if analysis.get("success"):
+                scores.append(analysis.get("score", 0))
+                results["total_issues"] += len(analysis.get("issues", []))
                 
-                if analysis.get("success"):
-                    scores.append(analysis.get("score", 0))
-                    results["total_issues"] += len(analysis.get("issues", []))
-                    
-                    # Track critical issues
+                # Track critical issues (desktop views only, as before)
+                if not is_mobile:
                     for issue in analysis.get("issues", []):
                         if issue.get("severity") == "critical":
                             results["critical_issues"].append({
-                                "page": file_result.get("file"),
+                                "page": page,
                                 "issue": issue
                             })
-            
-            # Also check mobile screenshot
-            for viewport_test in file_result.get("viewport_tests", []):
-                mobile_screenshot = viewport_test.get("screenshot")
-                if mobile_screenshot and os.path.exists(mobile_screenshot):
-                    print(f"[Visual QA] Analyzing mobile: {os.path.basename(mobile_screenshot)}")
-                    
-                    analysis = self.analyze_screenshot(
-                        mobile_screenshot,
-                        f"Mobile view of: {file_result.get('file', 'unknown')}"
-                    )
-                    
-                    results["pages_analyzed"].append({
-                        "page": f"{file_result.get('file')} (mobile)",
-                        "screenshot": mobile_screenshot,
-                        "analysis": analysis
-                    })
-                    
-                    if analysis.get("success"):
-                        scores.append(analysis.get("score", 0))
-                        results["total_issues"] += len(analysis.get("issues", []))
         
         # Calculate average score
         if scores:
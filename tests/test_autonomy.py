@@ -5,6 +5,7 @@ Tests all critical components for autonomous operation.
 import sys
 import os
 import json
+import time
 import unittest
 from datetime import datetime
 from typing import Dict, List
@@ -264,6 +265,178 @@ class TestOrchestrator(unittest.TestCase):
         print(f"  [OK] Orchestrator initialized with {agent_count} agents")
 
 
+class TestSpecialistBatching(unittest.TestCase):
+    """Test run-ahead specialist steps (deferred saves)."""
+    
+    def _executor(self, release):
+        """Executor with batching on; specialists block on `release`, then save one doc."""
+        from agents.autonomous import AutonomousExecutor
+        
+        executor = AutonomousExecutor()
+        executor.specialist_batch_size = 3
+        executor._log = lambda msg: None
+        executor._get_step_context = lambda *args, **kwargs: ""
+        self.saved = []
+        executor._save_research_doc = lambda content, path, step: self.saved.append(step)
+        
+        def call_specialist(agent_name, step, project_path, context):
+            release.wait(5)
+            executor._save_output(executor._save_research_doc, "x" * 200, project_path, step)
+            return f"done: {step}"
+        
+        executor._call_specialist = call_specialist
+        return executor
+    
+    def test_deferred_saves_in_step_order(self):
+        """Saves from steps run ahead wait for the step's turn."""
+        import threading
+        
+        release = threading.Event()
+        executor = self._executor(release)
+        routing = {"agent": "frontend_dev", "category": "FRONTEND", "use_specialist": True}
+        upcoming = ["research competitor pricing", "write a blog post"]
+        executor._start_specialist_batch("build the page", routing, upcoming, "coding", "/tmp/p")
+        self.assertEqual(len(executor._specialist_futures), 2)
+        
+        release.set()
+        futures = [executor._specialist_futures.pop((step, "/tmp/p")) for step in upcoming]
+        for future in futures:
+            future.result()
+        self.assertEqual(self.saved, [])  # Nothing written from the worker threads
+        
+        for future in futures:
+            executor._finish_batched_step(future)
+        self.assertEqual(self.saved, upcoming)
+        print(f"  [OK] Deferred saves applied in order: {len(self.saved)}")
+    
+    def test_pause_discards_batched_steps(self):
+        """Pausing drops steps started ahead; their saves never happen."""
+        import threading
+        
+        release = threading.Event()
+        executor = self._executor(release)
+        routing = {"agent": "frontend_dev", "category": "FRONTEND", "use_specialist": True}
+        executor._start_specialist_batch(
+            "build the page", routing, ["research competitor pricing"], "coding", "/tmp/p"
+        )
+        future = executor._specialist_futures[("research competitor pricing", "/tmp/p")]
+        
+        executor._enter_pause("test")
+        release.set()
+        if not future.cancelled():
+            future.result()
+        
+        self.assertEqual(executor._specialist_futures, {})
+        self.assertEqual(self.saved, [])
+        print("  [OK] Paused run-ahead step discarded")
+
+
+class TestFileIndex(unittest.TestCase):
+    """Test the append-only .file_index.jsonl."""
+    
+    def setUp(self):
+        import tempfile
+        from agents.autonomous import AutonomousExecutor
+        
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index_path = os.path.join(self.tmp.name, ".file_index.jsonl")
+        self.legacy_path = self.index_path[:-1]
+        self.executor = AutonomousExecutor()
+        self.executor._log = lambda msg: None
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_legacy_index_converted(self):
+        """A legacy .json index is merged into the .jsonl and removed."""
+        with open(self.index_path, 'w', encoding='utf-8') as fh:
+            fh.write(json.dumps({"f": "app.py"}) + "\n")
+        with open(self.legacy_path, 'w', encoding='utf-8') as fh:
+            json.dump(["app.py", "utils.py"], fh)
+        
+        seen = self.executor._load_file_index(self.index_path)
+        
+        self.assertEqual(seen, {"app.py", "utils.py"})
+        self.assertFalse(os.path.exists(self.legacy_path))
+        with open(self.index_path, encoding='utf-8') as fh:
+            lines = [json.loads(line)["f"] for line in fh]
+        self.assertEqual(lines, ["app.py", "utils.py"])
+        print(f"  [OK] Legacy index converted: {sorted(seen)}")
+    
+    def test_corrupt_legacy_index_kept(self):
+        """An unreadable legacy index is left in place, not deleted."""
+        with open(self.legacy_path, 'w', encoding='utf-8') as fh:
+            fh.write('["app.py", "uti')
+        
+        seen = self.executor._load_file_index(self.index_path)
+        
+        self.assertEqual(seen, set())
+        self.assertTrue(os.path.exists(self.legacy_path))
+        print("  [OK] Corrupt legacy index kept")
+    
+    def test_torn_line_skipped(self):
+        """A half-written last line is skipped; earlier entries survive."""
+        with open(self.index_path, 'w', encoding='utf-8') as fh:
+            fh.write(json.dumps({"f": "app.py"}) + "\n" + '{"f": "uti')
+        
+        seen = self.executor._load_file_index(self.index_path)
+        self.assertEqual(seen, {"app.py"})
+        
+        # Entries appended after the torn line are still readable
+        with open(self.index_path, 'a', encoding='utf-8') as fh:
+            fh.write(json.dumps({"f": "main.py"}) + "\n")
+        self.assertEqual(self.executor._load_file_index(self.index_path), {"app.py", "main.py"})
+        print("  [OK] Torn line skipped")
+
+
+class TestControlCommands(unittest.TestCase):
+    """Test that pause/resume/modify_plan from other threads wait for the loop."""
+    
+    def test_commands_applied_at_check_pause(self):
+        """Cross-thread control calls only take effect inside _check_pause."""
+        import threading
+        from agents.autonomous import AutonomousExecutor
+        from agents.recycler import recycler
+        
+        executor = AutonomousExecutor()
+        executor._log = lambda msg: None
+        executor._queue_checkpoint = lambda *args, **kwargs: None
+        executor.is_running = True
+        executor._executor_thread_id = threading.get_ident()  # This thread is the loop
+        saved_steps = recycler.pending_steps
+        recycler.pending_steps = ["step one"]
+        try:
+            def control():
+                executor.modify_plan("add", "step two")
+                executor.pause("test")
+            
+            caller = threading.Thread(target=control)
+            caller.start()
+            caller.join()
+            
+            # Nothing applied yet: the loop has not reached a safe point
+            self.assertEqual(recycler.pending_steps, ["step one"])
+            self.assertFalse(executor.is_paused)
+            self.assertFalse(executor.pause_requested)
+            
+            def resume_when_paused():
+                while not executor.is_paused:
+                    time.sleep(0.01)
+                executor.resume(["add: step three"])
+            
+            resumer = threading.Thread(target=resume_when_paused)
+            resumer.start()
+            self.assertTrue(executor._check_pause())  # Blocks until resumed
+            resumer.join()
+            
+            self.assertFalse(executor.is_paused)
+            self.assertEqual(recycler.pending_steps, ["step one", "step two", "step three"])
+            print(f"  [OK] Commands applied at safe point: {recycler.pending_steps}")
+        finally:
+            recycler.pending_steps = saved_steps
+            executor.is_running = False
+
+
 def run_all_tests():
     """Run all test suites."""
     print("=" * 60)
@@ -286,6 +459,9 @@ def run_all_tests():
         TestRetryLogic,
         TestRouter,
         TestOrchestrator,
+        TestSpecialistBatching,
+        TestFileIndex,
+        TestControlCommands,
     ]
     
     for test_class in test_classes: